@@ -0,0 +1,31 @@
+"""add session user_id and expires_at indexes
+
+Revision ID: 3c9e1f4a8b21
+Revises: 7be7a7771319
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f4a8b21'
+down_revision: Union[str, None] = '7be7a7771319'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY agar tabel sessions tidak terkunci selama index dibuat
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_sessions_user_id'), 'sessions', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_sessions_expires_at'), 'sessions', ['expires_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_sessions_expires_at'), table_name='sessions', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_sessions_user_id'), table_name='sessions', postgresql_concurrently=True)
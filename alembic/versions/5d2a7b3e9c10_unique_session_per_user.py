@@ -0,0 +1,44 @@
+"""unique session per user
+
+Revision ID: 5d2a7b3e9c10
+Revises: 3c9e1f4a8b21
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a7b3e9c10'
+down_revision: Union[str, None] = '3c9e1f4a8b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Semua langkah dalam satu transaksi dengan lock yang menahan INSERT/UPDATE/DELETE
+    # (SELECT tetap jalan): tanpa lock, login dari versi lama bisa menyisipkan session
+    # duplikat di antara dedupe dan pembuatan unique index. Index dibuat biasa (bukan
+    # CONCURRENTLY) agar tidak ada jendela tanpa index unik; tabel sessions kecil
+    # (paling banyak satu baris per user setelah dedupe) sehingga lock-nya singkat.
+    op.execute("LOCK TABLE sessions IN SHARE ROW EXCLUSIVE MODE")
+    # Sisakan hanya session terbaru per user sebelum index dibuat unik
+    op.execute(
+        """
+        DELETE FROM sessions s
+        USING sessions newer
+        WHERE s.user_id = newer.user_id
+          AND (s.expires_at, s.id) < (newer.expires_at, newer.id)
+        """
+    )
+    # Unique index dipakai oleh INSERT ... ON CONFLICT (user_id) saat login
+    op.drop_index(op.f('ix_sessions_user_id'), table_name='sessions')
+    op.create_index(op.f('ix_sessions_user_id'), 'sessions', ['user_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sessions_user_id'), table_name='sessions')
+    op.create_index(op.f('ix_sessions_user_id'), 'sessions', ['user_id'], unique=False)
@@ -0,0 +1,33 @@
+"""add username prefix index
+
+Revision ID: b7e3d9a1f042
+Revises: 8a4f6c2d1e57
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d9a1f042'
+down_revision: Union[str, None] = '8a4f6c2d1e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # text_pattern_ops membandingkan per karakter (bukan collation), sehingga index
+    # bisa dipakai untuk pencarian prefix username
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_username_pattern', 'users', ['username'], unique=False,
+            postgresql_ops={'username': 'text_pattern_ops'}, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_username_pattern', table_name='users', postgresql_concurrently=True)
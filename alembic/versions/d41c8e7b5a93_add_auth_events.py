@@ -0,0 +1,37 @@
+"""add auth events
+
+Revision ID: d41c8e7b5a93
+Revises: b7e3d9a1f042
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41c8e7b5a93'
+down_revision: Union[str, None] = 'b7e3d9a1f042'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('auth_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('event', sa.String(), nullable=False),
+    sa.Column('ip', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auth_events_user_id'), 'auth_events', ['user_id'], unique=False)
+    op.create_index(op.f('ix_auth_events_created_at'), 'auth_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_auth_events_created_at'), table_name='auth_events')
+    op.drop_index(op.f('ix_auth_events_user_id'), table_name='auth_events')
+    op.drop_table('auth_events')
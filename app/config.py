@@ -9,12 +9,186 @@ env_path = Path(__file__).parent.parent / ".env"
 if env_path.exists():
     load_dotenv(dotenv_path=env_path, encoding="utf-8")
 
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Profil engine/pool database, dipilih lewat env DB_PROFILE (dev | prod | test).
+# Setiap nilai masih bisa dioverride satu per satu lewat env (mis. DB_POOL_SIZE).
+DB_PROFILES = {
+    "dev": {
+        "echo": True,
+        "echo_pool": False,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+    },
+    "prod": {
+        "echo": False,
+        "echo_pool": False,
+        "pool_size": 10,
+        "max_overflow": 5,
+        "pool_timeout": 5,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+    "test": {
+        "echo": False,
+        "echo_pool": False,
+        "pool_size": 2,
+        "max_overflow": 0,
+        "pool_timeout": 5,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+    },
+}
+
+DB_PROFILE = os.getenv('DB_PROFILE', 'dev')
+if DB_PROFILE not in DB_PROFILES:
+    raise ValueError(f"Unknown DB_PROFILE '{DB_PROFILE}', expected one of {', '.join(DB_PROFILES)}")
+_db_profile = DB_PROFILES[DB_PROFILE]
+
 class Config:
     DB_NAME = os.getenv('DB_NAME')
     DB_HOST = os.getenv('DB_HOST_NETWORK','localhost')
     DB_USER = os.getenv('DB_USER','postgres')
     DB_PASS = os.getenv('DB_PASS')
     DB_PORT = os.getenv('DB_PORT','5432')
+    # URL lengkap (opsional), menggantikan DB_* di atas, mis. sqlite+aiosqlite:///local.db
+    DATABASE_URL = os.getenv('DATABASE_URL')
+    # Read replica (opsional): handler read-only memakai replica selama replica sehat
+    # dan lag replikasinya <= DB_REPLICA_MAX_LAG detik, selain itu kembali ke primary
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+    DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+    DB_REPLICA_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '5'))
+
+    # Server (serve.py): jumlah proses worker dan batas total koneksi Postgres yang dibagi
+    # rata ke semua worker. Default 80 menyisakan ruang di bawah max_connections=100 bawaan
+    # Postgres untuk migrasi/admin; replica punya batas sendiri (default sama dengan primary).
+    HOST = os.getenv('HOST', '0.0.0.0')
+    PORT = int(os.getenv('PORT', '8080'))
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1))
+    DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '80'))
+    DB_REPLICA_MAX_CONNECTIONS = int(os.getenv('DB_REPLICA_MAX_CONNECTIONS', DB_MAX_CONNECTIONS))
+    SERVER_LOOP = os.getenv('SERVER_LOOP', 'auto')  # auto | uvloop | asyncio
+    SERVER_HTTP = os.getenv('SERVER_HTTP', 'auto')  # auto | httptools | h11
+
+    # Engine & connection pool (default diambil dari DB_PROFILE)
+    DB_PROFILE = DB_PROFILE
+    DB_ECHO = env_bool('DB_ECHO', _db_profile["echo"])
+    DB_ECHO_POOL = env_bool('DB_ECHO_POOL', _db_profile["echo_pool"])
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', _db_profile["pool_size"]))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', _db_profile["max_overflow"]))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', _db_profile["pool_timeout"]))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', _db_profile["pool_recycle"]))
+    DB_POOL_PRE_PING = env_bool('DB_POOL_PRE_PING', _db_profile["pool_pre_ping"])
+    # Pool read replica (default sama dengan pool primary)
+    DB_REPLICA_POOL_SIZE = int(os.getenv('DB_REPLICA_POOL_SIZE', DB_POOL_SIZE))
+    DB_REPLICA_MAX_OVERFLOW = int(os.getenv('DB_REPLICA_MAX_OVERFLOW', DB_MAX_OVERFLOW))
+    # Ukuran cache prepared statement asyncpg per koneksi (0 = nonaktif, mis. di belakang pgbouncer)
+    DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv('DB_PREPARED_STATEMENT_CACHE_SIZE', '100'))
+    # Jumlah koneksi pool yang dibuka saat startup (maksimal DB_POOL_SIZE)
+    DB_POOL_WARMUP = int(os.getenv('DB_POOL_WARMUP', '2'))
+
+    # Admission control: batas request bersamaan + antrean dengan deadline per kelompok route.
+    # Route murah (ADMISSION_BYPASS_PATHS) tidak pernah diantrekan; route auth (bcrypt) punya
+    # jalur sendiri agar tidak menghabiskan slot route lain. Request yang ditolak mendapat 503.
+    # Request auth hanya memegang koneksi sebentar (tidak selama bcrypt), jadi kedua lane boleh
+    # melebihi pool; request yang diterima menunggu koneksi paling lama selama deadline lane-nya.
+    ADMISSION_CONTROL_ENABLED = env_bool('ADMISSION_CONTROL_ENABLED', True)
+    ADMISSION_BYPASS_PATHS = os.getenv('ADMISSION_BYPASS_PATHS', '/,/check/live,/check/ready,/metrics').split(',')
+    ADMISSION_AUTH_PATHS = os.getenv('ADMISSION_AUTH_PATHS', '/auth/login,/auth/register').split(',')
+    ADMISSION_DB_QUEUE_SIZE = int(os.getenv('ADMISSION_DB_QUEUE_SIZE', '100'))
+    ADMISSION_DB_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_DB_QUEUE_TIMEOUT', '1'))
+    ADMISSION_AUTH_CONCURRENCY = int(os.getenv('ADMISSION_AUTH_CONCURRENCY', '16'))
+    ADMISSION_DB_CONCURRENCY = int(os.getenv('ADMISSION_DB_CONCURRENCY', DB_POOL_SIZE + DB_MAX_OVERFLOW))
+    ADMISSION_AUTH_QUEUE_SIZE = int(os.getenv('ADMISSION_AUTH_QUEUE_SIZE', '32'))
+    ADMISSION_AUTH_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_AUTH_QUEUE_TIMEOUT', '2'))
+    # Nilai header Retry-After (detik) untuk response 503 karena server sibuk
+    ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', '1'))
+
+    # Background prober untuk readiness check
+    DB_PROBE_INTERVAL = float(os.getenv('DB_PROBE_INTERVAL', '10'))
+    DB_PROBE_TIMEOUT = float(os.getenv('DB_PROBE_TIMEOUT', '2'))
+
+    # Background reaper untuk session kedaluwarsa (interval <= 0 = nonaktif)
+    SESSION_REAPER_INTERVAL = float(os.getenv('SESSION_REAPER_INTERVAL', '300'))
+    SESSION_REAPER_BATCH_SIZE = int(os.getenv('SESSION_REAPER_BATCH_SIZE', '1000'))
+
+    # Worker pool untuk hashing password (bcrypt) di luar event loop
+    PASSWORD_HASH_EXECUTOR = os.getenv('PASSWORD_HASH_EXECUTOR', 'thread')  # thread | process
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '64'))
+    # Cost factor bcrypt; hasilkan rekomendasi dengan `python -m scripts.calibrate_bcrypt`.
+    # Hash dengan cost berbeda akan di-hash ulang otomatis saat login berhasil.
+    PASSWORD_BCRYPT_ROUNDS = int(os.getenv('PASSWORD_BCRYPT_ROUNDS', '12'))
+
+    # Mode session: "db" (default, session_id disimpan di tabel sessions) atau "token"
+    # (token HMAC berisi id/username/email/expiry, divalidasi tanpa database)
+    SESSION_MODE = os.getenv('SESSION_MODE', 'db')
+    SESSION_TOKEN_SECRET = os.getenv('SESSION_TOKEN_SECRET')
+    # Interval sinkronisasi daftar token yang di-logout antar worker/instance (detik)
+    TOKEN_REVOCATION_SYNC_INTERVAL = float(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', '2'))
+
+    # Umur session sejak login (detik)
+    SESSION_TTL = float(os.getenv('SESSION_TTL', '86400'))
+    # Sliding expiry (mode db): setiap pemakaian session memperpanjang expires_at menjadi
+    # sekarang + SESSION_TTL, paling sering sekali per SESSION_TOUCH_INTERVAL detik per session.
+    # Perpanjangan dikumpulkan di memori dan ditulis per batch setiap SESSION_TOUCH_FLUSH_INTERVAL.
+    SESSION_SLIDING_EXPIRY = env_bool('SESSION_SLIDING_EXPIRY', False)
+    SESSION_TOUCH_INTERVAL = float(os.getenv('SESSION_TOUCH_INTERVAL', '300'))
+    SESSION_TOUCH_FLUSH_INTERVAL = float(os.getenv('SESSION_TOUCH_FLUSH_INTERVAL', '10'))
+    SESSION_TOUCH_BATCH_SIZE = int(os.getenv('SESSION_TOUCH_BATCH_SIZE', '1000'))
+    SESSION_TOUCH_MAX_PENDING = int(os.getenv('SESSION_TOUCH_MAX_PENDING', '100000'))
+
+    # Jumlah maksimum session_id per request POST /auth/sessions/validate
+    SESSION_BATCH_MAX_SIZE = int(os.getenv('SESSION_BATCH_MAX_SIZE', '100'))
+
+    # Cache session_id -> user (per proses)
+    SESSION_CACHE_MAX_SIZE = int(os.getenv('SESSION_CACHE_MAX_SIZE', '10000'))
+    SESSION_CACHE_TTL = float(os.getenv('SESSION_CACHE_TTL', '60'))
+
+    # Log event auth (register/login/logout) yang ditulis per batch di background
+    AUTH_EVENT_LOG_ENABLED = env_bool('AUTH_EVENT_LOG_ENABLED', True)
+    AUTH_EVENT_QUEUE_SIZE = int(os.getenv('AUTH_EVENT_QUEUE_SIZE', '10000'))
+    AUTH_EVENT_BATCH_SIZE = int(os.getenv('AUTH_EVENT_BATCH_SIZE', '500'))
+    AUTH_EVENT_FLUSH_INTERVAL = float(os.getenv('AUTH_EVENT_FLUSH_INTERVAL', '1'))
+
+    # Rate limit login (token bucket); 0 = nonaktif
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE = int(os.getenv('LOGIN_RATE_LIMIT_IP_PER_MINUTE', '30'))
+    LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE = int(os.getenv('LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE', '10'))
+    RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', '100000'))
+    # Jumlah proxy tepercaya di depan API (mis. 1 untuk load balancer Cloud Run);
+    # IP client diambil dari X-Forwarded-For sesuai jumlah hop ini
+    TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', '0'))
+
+    # Batas ukuran request body (bytes)
+    MAX_REQUEST_BODY_BYTES = int(os.getenv('MAX_REQUEST_BODY_BYTES', '16384'))
+
+    # Kompresi gzip untuk response >= GZIP_MINIMUM_SIZE bytes jika klien mengirim Accept-Encoding: gzip
+    GZIP_MINIMUM_SIZE = int(os.getenv('GZIP_MINIMUM_SIZE', '1024'))
+    GZIP_COMPRESS_LEVEL = int(os.getenv('GZIP_COMPRESS_LEVEL', '5'))
+
+    # Pagination & export GET /users
+    USERS_PAGE_DEFAULT_LIMIT = int(os.getenv('USERS_PAGE_DEFAULT_LIMIT', '100'))
+    USERS_PAGE_MAX_LIMIT = int(os.getenv('USERS_PAGE_MAX_LIMIT', '1000'))
+    USERS_EXPORT_CHUNK_SIZE = int(os.getenv('USERS_EXPORT_CHUNK_SIZE', '1000'))
+
+    # Pencarian prefix username GET /users/search, dengan cache LRU prefix terpopuler (per proses)
+    USERS_SEARCH_DEFAULT_LIMIT = int(os.getenv('USERS_SEARCH_DEFAULT_LIMIT', '20'))
+    USERS_SEARCH_MAX_LIMIT = int(os.getenv('USERS_SEARCH_MAX_LIMIT', '100'))
+    USERS_SEARCH_CACHE_SIZE = int(os.getenv('USERS_SEARCH_CACHE_SIZE', '1024'))
+    USERS_SEARCH_CACHE_TTL = float(os.getenv('USERS_SEARCH_CACHE_TTL', '30'))
+
+if Config.SESSION_MODE not in ("db", "token"):
+    raise ValueError(f"Unknown SESSION_MODE '{Config.SESSION_MODE}', expected one of db, token")
+if Config.SESSION_MODE == "token" and not Config.SESSION_TOKEN_SECRET:
+    raise ValueError("SESSION_TOKEN_SECRET must be set when SESSION_MODE=token")
 
 # create instance config
-config = Config()
\ No newline at end of file
+config = Config()
@@ -1,27 +1,396 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+import os
+import time
+from contextvars import ContextVar
+from fastapi import Depends
+from sqlalchemy import any_, bindparam, event, exc, text
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.util import queue as sqla_queue
+from sqlalchemy.dialects import postgresql, sqlite
 from .config import Config
+from .src.services.metrics import db_queries_total
 
-# Inisialisasi engine untuk berinteraksi dengan database menggunakan asyncpg
-engine = create_async_engine(
-    f"postgresql+asyncpg://{Config.DB_USER}:{Config.DB_PASS}@{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}",
-    echo=True,
-)
+logger = logging.getLogger(__name__)
+
+
+# Batas tunggu checkout koneksi untuk request yang sedang berjalan (detik), di-set oleh
+# AdmissionControlMiddleware ke deadline lane-nya. None = DB_POOL_TIMEOUT.
+checkout_timeout: ContextVar[float | None] = ContextVar("checkout_timeout", default=None)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool async standar yang juga mencatat berapa kali (dan berapa lama)
+    request harus menunggu koneksi karena pool + overflow sudah habis.
+    Lama tunggu dibatasi `checkout_timeout` jika lebih pendek dari `pool_timeout`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self.waits = 0
+        self.wait_timeouts = 0
+        self.wait_time = 0.0
+
+    def _do_get(self):
+        must_wait = (
+            self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+            and self._pool.empty()
+        )
+        if not must_wait:
+            return super()._do_get()
+
+        self.waiting += 1
+        self.waits += 1
+        started = time.perf_counter()
+        timeout = checkout_timeout.get()
+        try:
+            if timeout is None or timeout >= self._timeout:
+                return super()._do_get()
+            return self._wait_for_connection(timeout)
+        except exc.TimeoutError:
+            self.wait_timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            self.wait_time += time.perf_counter() - started
+
+    def _wait_for_connection(self, timeout: float):
+        # Seperti QueuePool._do_get saat pool + overflow penuh, dengan batas tunggu per request
+        try:
+            return self._pool.get(True, timeout)
+        except sqla_queue.Empty:
+            pass
+        if self._overflow < self._max_overflow:
+            # Koneksi overflow ditutup selama menunggu: ada slot untuk koneksi baru
+            return super()._do_get()
+        raise exc.TimeoutError(
+            "QueuePool limit of size %d overflow %d reached, connection timed out, timeout %0.2f"
+            % (self.size(), self.overflow(), timeout),
+            code="3o7r",
+        )
+
+
+# Engine dibuat saat startup aplikasi (lifespan), bukan saat modul di-import,
+# sehingga setiap proses worker punya engine dan pool koneksinya sendiri
+engine: AsyncEngine | None = None
+# PID proses yang membuat `engine`; koneksi pool tidak boleh dipakai lintas fork
+_engine_pid: int | None = None
+
+# Membuat SessionFactory untuk menghasilkan sesi asinkronus (di-bind ke engine saat engine dibuat)
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+
+
+
+class ReplicaSession(AsyncSession):
+    """
+    Sesi read-only ke replica. Seperti AsyncSession biasa, koneksi baru dibuka saat
+    query pertama (request yang dilayani dari cache tidak menyentuh replica). Jika
+    koneksi ke replica gagal, replica ditandai tidak tersedia dan sesi ini dialihkan
+    ke primary sebelum query dijalankan.
+    """
+
+    _connection_checked = False
+
+    async def _ensure_connection(self):
+        if self._connection_checked:
+            return
+        self._connection_checked = True
+        try:
+            await super().connection()
+        except (exc.SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+            await self.close()
+            mark_replica_unavailable(str(e))
+            primary = get_engine()
+            self.bind = primary
+            self.sync_session.bind = primary.sync_engine
+
+    async def connection(self, *args, **kwargs):
+        await self._ensure_connection()
+        return await super().connection(*args, **kwargs)
+
+    async def execute(self, *args, **kwargs):
+        await self._ensure_connection()
+        return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        await self._ensure_connection()
+        return await super().scalar(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        await self._ensure_connection()
+        return await super().scalars(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        await self._ensure_connection()
+        return await super().get(*args, **kwargs)
+
+    async def stream(self, *args, **kwargs):
+        await self._ensure_connection()
+        return await super().stream(*args, **kwargs)
+
+    async def stream_scalars(self, *args, **kwargs):
+        await self._ensure_connection()
+        return await super().stream_scalars(*args, **kwargs)
+
+
+# Engine & SessionFactory read replica (hanya dibuat jika DATABASE_REPLICA_URL diset)
+replica_engine: AsyncEngine | None = None
+_replica_pid: int | None = None
+ReadSessionLocal = async_sessionmaker(class_=ReplicaSession, expire_on_commit=False)
+
+# Status replica, diperbarui oleh ReplicaMonitor. Selama belum dicek, baca dari primary.
+replica_health = {"available": False, "lag_seconds": None, "last_error": None, "fallbacks": 0}
+
+
+def _with_driver_options(url: URL) -> URL:
+    if url.drivername == "postgresql+asyncpg":
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(Config.DB_PREPARED_STATEMENT_CACHE_SIZE)}
+        )
+    return url
+
+
+def get_database_url() -> URL:
+    if Config.DATABASE_URL:
+        url = make_url(Config.DATABASE_URL)
+    else:
+        url = URL.create(
+            "postgresql+asyncpg",
+            username=Config.DB_USER,
+            password=Config.DB_PASS,
+            host=Config.DB_HOST,
+            port=int(Config.DB_PORT),
+            database=Config.DB_NAME,
+        )
+    return _with_driver_options(url)
+
+
+def get_replica_url() -> URL | None:
+    if not Config.DATABASE_REPLICA_URL:
+        return None
+    return _with_driver_options(make_url(Config.DATABASE_REPLICA_URL))
+
+
+def create_engine(url: URL | None = None, pool_size: int | None = None, max_overflow: int | None = None) -> AsyncEngine:
+    # Inisialisasi engine untuk berinteraksi dengan database menggunakan asyncpg
+    return create_async_engine(
+        url or get_database_url(),
+        echo=Config.DB_ECHO,
+        echo_pool=Config.DB_ECHO_POOL,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=Config.DB_POOL_SIZE if pool_size is None else pool_size,
+        max_overflow=Config.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+    )
+
+
+def configure_engine(new_engine: AsyncEngine):
+    """Memasang engine yang dipakai aplikasi (juga dipakai benchmark untuk database lokal)."""
+    global engine, _engine_pid
+    engine = new_engine
+    _engine_pid = os.getpid()
+    AsyncSessionLocal.configure(bind=new_engine)
+
+
+def get_engine() -> AsyncEngine:
+    # Engine dibuat saat dipakai pertama kali jika lifespan belum berjalan (mis. script/CLI)
+    if engine is None:
+        configure_engine(create_engine())
+    elif _engine_pid != os.getpid():
+        # Engine diwarisi dari proses induk lewat fork: lepaskan pool lama tanpa
+        # menutup socket milik induk, lalu buat engine baru untuk proses ini
+        engine.sync_engine.dispose(close=False)
+        configure_engine(create_engine())
+    return engine
+
+
+def get_replica_engine() -> AsyncEngine | None:
+    """Engine read replica, atau None jika replica tidak dikonfigurasi."""
+    global replica_engine, _replica_pid
+    # Jalur per request: URL hanya di-parse saat engine dibuat, bukan di setiap pemanggilan
+    if replica_engine is not None and _replica_pid == os.getpid():
+        return replica_engine
+    if not Config.DATABASE_REPLICA_URL:
+        return None
+    if replica_engine is not None:
+        # Sama seperti get_engine(): jangan pakai pool yang diwarisi lewat fork
+        replica_engine.sync_engine.dispose(close=False)
+    replica_engine = create_engine(get_replica_url(), Config.DB_REPLICA_POOL_SIZE, Config.DB_REPLICA_MAX_OVERFLOW)
+    _replica_pid = os.getpid()
+    ReadSessionLocal.configure(bind=replica_engine)
+    return replica_engine
+
+
+def mark_replica_unavailable(error: str):
+    """Dipanggil saat koneksi ke replica gagal; pembacaan kembali ke primary sampai cek berikutnya."""
+    replica_health["available"] = False
+    replica_health["last_error"] = error
+    replica_health["fallbacks"] += 1
+    logger.warning("Read replica unavailable, falling back to primary: %s", error)
+
+
+async def init_engine(warmup_connections: int = 0) -> AsyncEngine:
+    """
+    Membuat engine dan membuka `warmup_connections` koneksi pool di awal, agar
+    request pertama setelah cold start tidak menanggung biaya membuka koneksi.
+    """
+    current = get_engine()
+    warmup_connections = min(warmup_connections, Config.DB_POOL_SIZE)
+    if warmup_connections <= 0:
+        return current
+
+    async def open_connection():
+        connection = await current.connect()
+        await connection.execute(text("SELECT 1"))
+        return connection
+
+    results = await asyncio.gather(
+        *(open_connection() for _ in range(warmup_connections)), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning("Database pool warmup failed: %s", result)
+        else:
+            # Dikembalikan ke pool dalam keadaan terbuka
+            await result.close()
+    return current
+
+
+async def dispose_engine():
+    global engine, replica_engine
+    if engine is not None:
+        await engine.dispose()
+        engine = None
+    if replica_engine is not None:
+        await replica_engine.dispose()
+        replica_engine = None
+
+
+# Statistik query database untuk request yang sedang berjalan: [jumlah query, total detik].
+# Di-set oleh MetricsMiddleware untuk setiap request HTTP.
+request_db_stats: ContextVar[list | None] = ContextVar("request_db_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    db_queries_total.inc()
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
 
-# Membuat SessionFactory untuk menghasilkan sesi asinkronus
-AsyncSessionLocal = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
-)
 
 # Base digunakan untuk deklarasi model ORM
 Base = declarative_base()
 
+# Sesi baru di luar dependency (background task, streaming response)
+def new_session() -> AsyncSession:
+    get_engine()
+    return AsyncSessionLocal()
+
+
 # Dependency untuk mengelola sesi database asinkronus
 async def get_db():
     """
     Menghasilkan sesi database asinkronus dan menutupnya setelah digunakan.
     """
-    async with AsyncSessionLocal() as db:
+    async with new_session() as db:
         yield db  # Make sure this returns an AsyncSession
 
+
+def replica_in_use() -> bool:
+    return get_replica_engine() is not None and replica_health["available"]
+
+
+def open_read_session() -> AsyncSession:
+    """
+    Sesi baru untuk query read-only di luar dependency (mis. streaming response):
+    ke replica jika tersedia (fallback ke primary saat query pertama), selain itu ke primary.
+    """
+    if replica_in_use():
+        return ReadSessionLocal()
+    return new_session()
+
+
+# Dependency sesi read-only (replica dengan fallback ke primary).
+# Tanpa replica (atau saat replica tidak tersedia) sesi `get_db` milik request dipakai ulang,
+# sehingga satu request tidak pernah memegang dua koneksi dari pool primary.
+# Jangan dipakai untuk write atau membaca data yang baru saja ditulis di request yang sama.
+async def get_read_db(db: AsyncSession = Depends(get_db)):
+    if not replica_in_use():
+        yield db
+        return
+    async with ReadSessionLocal() as read_db:
+        yield read_db
+
+
+async def first_with_primary_fallback(read_db: AsyncSession, db: AsyncSession, fetch, *args):
+    """
+    Menjalankan `fetch(read_db, *args)` (query yang mengembalikan satu baris atau None).
+    Jika tidak ada hasil dan sesi read-only bukan primary, query diulang di primary,
+    karena data yang baru ditulis (user/session baru) mungkin belum sampai ke replica.
+    """
+    row = await fetch(read_db, *args)
+    if row is None and read_db is not db and read_db.get_bind() is not db.get_bind():
+        row = await fetch(db, *args)
+    return row
+
+
+def dialect_insert(db: AsyncSession, model):
+    """
+    INSERT yang mendukung ON CONFLICT ... RETURNING sesuai dialect koneksi
+    (PostgreSQL, atau SQLite untuk database lokal pada benchmark).
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def any_of(db: AsyncSession, column, values: list):
+    """
+    `column = ANY(:values)` dengan satu parameter array di PostgreSQL, sehingga SQL-nya
+    sama untuk berapa pun jumlah nilai (satu prepared statement); IN (...) di SQLite.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(bindparam(f"{column.key}_values", values, type_=postgresql.ARRAY(column.type)))
+    return column.in_(values)
+
+
+def get_pool_stats() -> dict:
+    """
+    Statistik pool koneksi saat ini, untuk tuning ukuran pool saat load test.
+    """
+    pool = get_engine().sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        # Engine dari configure_engine bisa memakai pool lain (mis. NullPool untuk aiosqlite)
+        return {
+            "profile": Config.DB_PROFILE,
+            **dict.fromkeys(("pool_size", "max_overflow", "checked_out", "checked_in", "overflow",
+                             "waiting", "waits_total", "wait_timeouts_total", "wait_seconds_total"), 0),
+        }
+    return {
+        "profile": Config.DB_PROFILE,
+        "pool_size": pool.size(),
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "waiting": getattr(pool, "waiting", 0),
+        "waits_total": getattr(pool, "waits", 0),
+        "wait_timeouts_total": getattr(pool, "wait_timeouts", 0),
+        "wait_seconds_total": round(getattr(pool, "wait_time", 0.0), 6),
+    }
@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from .config import Config
+from .database import get_db, get_read_db, first_with_primary_fallback
+from .src.repositories.auth_repository import fetch_session_user
+from .src.services.session_cache import session_cache
+from .src.services.session_toucher import session_toucher
+from .src.services.session_tokens import resolve_token, token_revocations
+
+
+# Dependency untuk mengambil IP client, memperhitungkan proxy tepercaya di depan API
+async def get_client_ip(request: Request) -> str | None:
+    if Config.TRUSTED_PROXY_HOPS > 0:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            hops = [hop.strip() for hop in forwarded_for.split(",")]
+            return hops[max(len(hops) - Config.TRUSTED_PROXY_HOPS, 0)]
+    return request.client.host if request.client else None
+
+
+async def _resolve_user(session_id: str | None, read_db: AsyncSession, db: AsyncSession) -> dict | None:
+    """
+    Meresolusi session_id menjadi data user dengan satu query JOIN (jalur cepat Core).
+    Session yang sudah kedaluwarsa difilter langsung di SQL. Dengan sliding expiry,
+    pemakaian session dicatat ke session_toucher (tanpa write di jalur request).
+    Mengembalikan None jika session tidak ditemukan atau sudah kedaluwarsa.
+    """
+    if not session_id:
+        return None
+
+    # Token session divalidasi sepenuhnya di dalam proses, tanpa cache maupun database
+    if Config.SESSION_MODE == "token":
+        return resolve_token(session_id)
+
+    cached = session_cache.get_entry(session_id)
+    if cached is not None and token_revocations.is_revoked(session_id):
+        # Di-logout lewat worker lain; entry cache di worker ini sudah basi
+        session_cache.invalidate(session_id)
+        cached = None
+    if cached is not None:
+        cached_user, expires_at = cached
+        session_toucher.touch(session_id, expires_at)
+        return cached_user
+
+    # expires_at disimpan sebagai UTC naive
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    row = await first_with_primary_fallback(read_db, db, fetch_session_user, session_id, now)
+    if row is None:
+        return None
+
+    user = {
+        "id": row.id,
+        "username": row.username,
+        "email": row.email
+    }
+    session_cache.set(session_id, user, row.expires_at)
+    session_toucher.touch(session_id, row.expires_at)
+    return user
+
+
+# Dependency "current user" untuk route read-only `/{session_id}`: membaca dari read replica
+# (fallback ke primary jika session belum ada di replica)
+async def get_current_user_read(
+    session_id: str,
+    read_db: AsyncSession = Depends(get_read_db),
+    db: AsyncSession = Depends(get_db),
+) -> dict | None:
+    return await _resolve_user(session_id, read_db, db)
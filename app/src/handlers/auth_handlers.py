@@ -1,23 +1,68 @@
 from fastapi import HTTPException, Response, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from passlib.context import CryptContext
-from app.database import get_db
+from sqlalchemy import or_, update
+from app.database import checkout_timeout, get_db, dialect_insert, new_session, first_with_primary_fallback, any_of
 from app.src.models.model import User, Session
+from app.src.repositories.auth_repository import fetch_login_user, delete_active_session
+from app.config import Config
+from app.src.services.session_cache import session_cache
+from app.src.services.session_tokens import session_tokens, token_revocations
+from app.src.services.rate_limiter import login_rate_limiter
+from app.src.services.auth_event_log import auth_event_log
+from app.src.services.password_service import pwd_context, password_hasher, PasswordHasherBusy
 from datetime import datetime, timedelta, timezone
-from fastapi.responses import JSONResponse
+from app.src.schemas.schema import session_response_adapter, message_response_adapter, session_validation_response_adapter
+from app.src.schemas.responses import json_response, error_response, server_error_response, busy_response
 from zoneinfo import ZoneInfo
+import asyncio
+import logging
+import math
+import time
 import uuid
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Function to verify the user's password
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+logger = logging.getLogger(__name__)
 
+# Task rehash yang sedang berjalan (disimpan agar tidak di-garbage collect)
+_rehash_tasks: set[asyncio.Task] = set()
 
-# Function to hash a new password
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+
+# Hash ulang password dengan cost bcrypt saat ini, di luar jalur request
+async def rehash_password(user_id: int, password: str, old_hash: str):
+    # Task menyalin context request: batas tunggu koneksi dari lane admission tidak berlaku di sini
+    checkout_timeout.set(None)
+    try:
+        new_hash = await password_hasher.hash(password)
+        async with new_session() as db:
+            # Hanya update jika hash belum diubah oleh proses lain
+            await db.execute(
+                update(User)
+                .where(User.id == user_id, User.password == old_hash)
+                .values(password=new_hash)
+            )
+            await db.commit()
+    except PasswordHasherBusy:
+        # Dicoba lagi pada login berikutnya
+        pass
+    except Exception:
+        logger.exception("Failed to rehash password for user %s", user_id)
+
+
+# Response cepat ketika worker pool hashing sedang penuh
+def hasher_busy_response():
+    return busy_response()
+
+
+async def _release_connections(*sessions: AsyncSession | None):
+    # Mengakhiri transaksi read-only agar koneksinya kembali ke pool (read_db bisa sama dengan db)
+    for session in sessions:
+        if session is not None:
+            await session.rollback()
+
+
+# Response error untuk request yang ditolak sebelum hashing (username/email sudah dipakai)
+def already_registered_response(field: str):
+    return error_response(400, f"{field} already registered")
 
 
 # Handler for user registration
@@ -26,201 +71,289 @@ async def register_user(
     username: str,
     email: str,
     password: str,
-    db: AsyncSession  
+    db: AsyncSession,
+    read_db: AsyncSession | None = None,
+    client_ip: str | None = None
 ):
-    hashed_password = hash_password(password)
-
-    # Cek apakah username sudah terdaftar
-    result = await db.execute(select(User).filter(User.username == username))
-    user = result.scalars().first()
-
-    if user:
-      
-        return JSONResponse(
-            status_code=400,  
-            content={
-                "status": "error",
-                "message": "Username already registered",
-                "time": datetime.now(timezone.utc).isoformat()
-            }
+    try:
+        # Cek username dan email sekaligus sebelum hashing, agar request duplikat
+        # tidak membuang satu komputasi bcrypt. Boleh dari replica: jika replica
+        # tertinggal, duplikat tetap ditolak oleh ON CONFLICT di primary.
+        result = await (read_db or db).execute(
+            select(User.username, User.email)
+            .where(or_(User.username == username, User.email == email))
+            .limit(1)
         )
+        existing = result.first()
+        # Koneksi dikembalikan ke pool sebelum bcrypt, bukan ditahan selama hashing
+        await _release_connections(read_db, db)
+        if existing:
+            return already_registered_response("Username" if existing.username == username else "Email")
 
-    # Membuat user baru
-    user = User(username=username, email=email, password=hashed_password)
-    db.add(user)
-
-    try:
-        # Menyimpan user baru
-        await db.commit()
+        try:
+            hashed_password = await password_hasher.hash(password)
+        except PasswordHasherBusy:
+            return hasher_busy_response()
 
         # Membuat session baru
         session_id = str(uuid.uuid4())
-        expires_at = datetime.now(timezone.utc) + timedelta(hours=24)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=Config.SESSION_TTL)
         expires_at_naive = expires_at.replace(tzinfo=None)
 
-        session = Session(
-            session_id=session_id,
-            user_id=user.id,
-            expires_at=expires_at_naive  
-        )
-        
-        db.add(session)
+        # User dan session dibuat dalam satu transaksi
+        user_id = (await db.execute(
+            dialect_insert(db, User)
+            .values(username=username, email=email, password=hashed_password)
+            .on_conflict_do_nothing()
+            .returning(User.id)
+        )).scalar()
+
+        if user_id is None:
+            # Username/email didaftarkan oleh request lain setelah pengecekan di atas
+            await db.rollback()
+            return already_registered_response("Username or email")
+
+        if Config.SESSION_MODE == "token":
+            # Token stateless: tidak ada baris session yang perlu disimpan
+            session_id = session_tokens.issue(user_id, username, email, expires_at_naive)
+        else:
+            await db.execute(
+                dialect_insert(db, Session)
+                .values(session_id=session_id, user_id=user_id, expires_at=expires_at_naive)
+            )
         await db.commit()
+        auth_event_log.record("register", user_id, client_ip)
 
-        return JSONResponse(
-            status_code=200,  
-            content={
+        return json_response(
+            session_response_adapter,
+            {
                 "status": "success",
                 "message": "User successfully registered",
                 "session_id": session_id,
-                "expires_at": expires_at_naive.isoformat(),
+                "expires_at": expires_at_naive,
             }
         )
 
     except Exception as e:
         # Rollback jika terjadi error
         await db.rollback()
-        return JSONResponse(
-            status_code=500,  
-            content={
-                "status": "error",
-                "message": f"An error occurred while registering the user: {str(e)}",
-                "time": datetime.now(timezone.utc).isoformat()
-            }
-        )
+        return server_error_response("An error occurred while registering the user", e)
 
 
 
-async def login_user(username: str, password: str, db: AsyncSession):
+async def login_user(
+    username: str,
+    password: str,
+    db: AsyncSession,
+    client_ip: str | None = None,
+    read_db: AsyncSession | None = None
+):
+    # Rate limit per IP dan per username, sebelum query database maupun bcrypt
+    retry_after = await login_rate_limiter.check(client_ip, username)
+    if retry_after:
+        return error_response(
+            429,
+            "Too many login attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
     try:
-        # Query user berdasarkan username
-        db_user = await db.execute(select(User).filter(User.username == username))
-        user = db_user.scalars().first()
+        # Query user berdasarkan username (hanya kolom yang dibutuhkan), dari replica
+        # dengan fallback ke primary untuk user yang baru saja register
+        user = await first_with_primary_fallback(read_db or db, db, fetch_login_user, username)
+        await _release_connections(read_db, db)
 
         # Validasi apakah user ditemukan
         if not user:
             # Jika username tidak ditemukan, kembalikan response error 401
-            return JSONResponse(
-                status_code=401, 
-                content={
-                    "status": "error",
-                    "message": "Username not found",
-                    "time": datetime.now(timezone.utc).isoformat()
-                }
-            )
+            auth_event_log.record("login_failed", None, client_ip)
+            return error_response(401, "Username not found")
 
         # Validasi password
-        if not verify_password(password, user.password):
+        try:
+            password_valid = await password_hasher.verify(password, user.password)
+        except PasswordHasherBusy:
+            return hasher_busy_response()
+
+        if not password_valid:
             # Jika password salah, kembalikan response error 401
-            return JSONResponse(
-                status_code=401,  
-                content={
-                    "status": "error",
-                    "message": "Incorrect password",
-                    "time": datetime.now(timezone.utc).isoformat()
-                }
-            )
+            auth_event_log.record("login_failed", user.id, client_ip)
+            return error_response(401, "Incorrect password")
+
+        # Hash lama (cost bcrypt berbeda) diperbarui di background
+        if pwd_context.needs_update(user.password):
+            task = asyncio.create_task(rehash_password(user.id, password, user.password))
+            _rehash_tasks.add(task)
+            task.add_done_callback(_rehash_tasks.discard)
 
         # Generate session ID (UUID)
         session_id = str(uuid.uuid4())
-        expires_at = datetime.now(timezone.utc) + timedelta(hours=24)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=Config.SESSION_TTL)
         expires_at_naive = expires_at.replace(tzinfo=None)
 
-        # Cek jika ada session aktif untuk user
-        db_session = await db.execute(select(Session).filter(Session.user_id == user.id))
-        existing_session = db_session.scalars().first()
-
-        if existing_session:
-            # Jika session sudah ada, update waktu kedaluwarsa
-            existing_session.expires_at = expires_at_naive
-            db.add(existing_session)
-            await db.commit()
+        auth_event_log.record("login", user.id, client_ip)
 
-            # Return session yang diperbarui
-            return JSONResponse(
-                status_code=200, 
-                content={
+        if Config.SESSION_MODE == "token":
+            # Token stateless: login tidak menulis ke database sama sekali
+            return json_response(
+                session_response_adapter,
+                {
                     "status": "success",
                     "message": "Login successfully",
-                    "session_id": existing_session.session_id,
-                    "expires_at": expires_at_naive.isoformat(),
-                   
+                    "session_id": session_tokens.issue(user.id, username, user.email, expires_at_naive),
+                    "expires_at": expires_at_naive,
                 }
             )
-        else:
-            # Jika tidak ada session, buat session baru
-            session = Session(
-                session_id=session_id,
-                user_id=user.id,
-                expires_at=expires_at_naive
-            )
-            db.add(session)
-            await db.commit()
 
-            # Return session baru
-            return JSONResponse(
-                status_code=200,  
-                content={
-                    "status": "success",
-                    "message": "Login successful",
-                    "session_id": session_id,
-                    "expires_at": expires_at_naive.isoformat(),
-                   
-                }
+        # Upsert session per user: jika sudah ada, hanya waktu kedaluwarsa yang diperbarui
+        # dan session_id lama tetap dipakai
+        insert_session = dialect_insert(db, Session).values(
+            session_id=session_id,
+            user_id=user.id,
+            expires_at=expires_at_naive
+        )
+        session_id = (await db.execute(
+            insert_session
+            .on_conflict_do_update(
+                index_elements=[Session.user_id],
+                set_={"expires_at": insert_session.excluded.expires_at}
             )
+            .returning(Session.session_id)
+        )).scalar()
+        await db.commit()
+        session_cache.invalidate(session_id)
 
-    except Exception as e:
-        # Menangani error jika terjadi masalah selama login atau operasi database
-        return JSONResponse(
-            status_code=500,  # Status 500 Internal Server Error
-            content={
-                "status": "error",
-                "message": f"An error occurred during login: {str(e)}",
-                "time": datetime.now(timezone.utc).isoformat()
+        return json_response(
+            session_response_adapter,
+            {
+                "status": "success",
+                "message": "Login successfully",
+                "session_id": session_id,
+                "expires_at": expires_at_naive,
             }
         )
+
+    except Exception as e:
+        await db.rollback()
+        # Menangani error jika terjadi masalah selama login atau operasi database
+        return server_error_response("An error occurred during login", e)
     
 # Handler for user logout
-async def logout_user(session_id: str, db: AsyncSession):
+async def logout_user(session_id: str | None, db: AsyncSession, client_ip: str | None = None):
     """
     Endpoint to log out the user.
-    It will remove the session from the database using the session_id.
+    It will remove the session from the database using the session_id,
+    validated and deleted in one DELETE ... RETURNING statement.
     """
     try:
-        # Query session berdasarkan session_id
-        db_session = await db.execute(select(Session).filter(Session.session_id == session_id))
-        session = db_session.scalars().first()
-
-        # Jika session tidak ditemukan atau session_id tidak valid
-        if not session:
-            return JSONResponse(
-                status_code=404,  
-                content={
-                    "status": "error",
-                    "message": "Session not found",
-                    "time": datetime.now().isoformat()
-                }
-            )
-
-      
-        await db.delete(session)
-        await db.commit()
+        if Config.SESSION_MODE == "token":
+            claims = session_tokens.decode(session_id) if session_id else None
+            # Token tidak valid, sudah kedaluwarsa, atau sudah di-logout
+            if claims is None or token_revocations.is_revoked(claims["jti"]):
+                return error_response(404, "Session not found")
+            # Token dicabut sampai waktu kedaluwarsanya
+            await token_revocations.revoke(db, claims)
+            user_id = claims["id"]
+        else:
+            # expires_at disimpan sebagai UTC naive
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            user_id = await delete_active_session(db, session_id, now) if session_id else None
+            # Jika session tidak ditemukan, sudah kedaluwarsa, atau session_id tidak valid
+            if user_id is None:
+                await db.rollback()
+                return error_response(404, "Session not found")
+            if session_cache.enabled:
+                # Worker lain membuang session ini dari cache-nya saat sinkronisasi berikutnya
+                await token_revocations.revoke_session(db, session_id)
+            await db.commit()
+            session_cache.invalidate(session_id)
+        auth_event_log.record("logout", user_id, client_ip)
 
-        return JSONResponse(
-            status_code=200, 
-            content={
+        return json_response(
+            message_response_adapter,
+            {
                 "status": "success",
                 "message": "Logged out successfully",
-                "time": datetime.now().isoformat()
+                "time": datetime.now(timezone.utc)
             }
         )
 
     except Exception as e:
-        return JSONResponse(
-            status_code=500, 
-            content={
-                "status": "error",
-                "message": f"An error occurred during logout: {str(e)}",
-                "time": datetime.now().isoformat()
+        return server_error_response("An error occurred during logout", e)
+
+
+async def _fetch_sessions(db: AsyncSession, session_ids: list[str]) -> dict:
+    # Satu query untuk semua session_id; session kedaluwarsa tetap diambil agar bisa ditandai "expired"
+    result = await db.execute(
+        select(Session.session_id, Session.expires_at, User.id, User.username, User.email)
+        .join(User, Session.user_id == User.id)
+        .where(any_of(db, Session.session_id, session_ids))
+    )
+    return {row.session_id: row for row in result}
+
+
+def _validate_tokens(session_ids: list[str]) -> dict:
+    results = {}
+    now = time.time()
+    for token in session_ids:
+        claims = session_tokens.decode(token, check_expiry=False)
+        if claims is None or token_revocations.is_revoked(claims["jti"]):
+            results[token] = {"valid": False, "reason": "not_found", "user": None}
+        elif claims["exp"] <= now:
+            results[token] = {"valid": False, "reason": "expired", "user": None}
+        else:
+            user = {"id": claims["id"], "username": claims["username"], "email": claims["email"]}
+            results[token] = {"valid": True, "reason": None, "user": user}
+    return results
+
+
+# Handler validasi banyak session sekaligus (untuk gateway/service internal)
+async def validate_sessions(session_ids: list[str], read_db: AsyncSession, db: AsyncSession):
+    try:
+        if Config.SESSION_MODE == "token":
+            results = _validate_tokens(session_ids)
+        else:
+            results = {}
+            pending = []
+            for session_id in dict.fromkeys(session_ids):
+                cached_user = session_cache.get(session_id)
+                if cached_user is not None and token_revocations.is_revoked(session_id):
+                    # Di-logout lewat worker lain; entry cache di worker ini sudah basi
+                    session_cache.invalidate(session_id)
+                    cached_user = None
+                if cached_user is not None:
+                    results[session_id] = {"valid": True, "reason": None, "user": cached_user}
+                else:
+                    pending.append(session_id)
+
+            rows = await _fetch_sessions(read_db, pending) if pending else {}
+            # Session yang belum ada di replica (baru dibuat) dicari ulang di primary
+            missing = [session_id for session_id in pending if session_id not in rows]
+            if missing and read_db.get_bind() is not db.get_bind():
+                rows.update(await _fetch_sessions(db, missing))
+
+            # expires_at disimpan sebagai UTC naive
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            for session_id in pending:
+                row = rows.get(session_id)
+                if row is None:
+                    results[session_id] = {"valid": False, "reason": "not_found", "user": None}
+                elif row.expires_at <= now:
+                    results[session_id] = {"valid": False, "reason": "expired", "user": None}
+                else:
+                    user = {"id": row.id, "username": row.username, "email": row.email}
+                    session_cache.set(session_id, user, row.expires_at)
+                    results[session_id] = {"valid": True, "reason": None, "user": user}
+
+        return json_response(
+            session_validation_response_adapter,
+            {
+                "status": "success",
+                # Urutan sesuai input (session_id duplikat hanya muncul sekali)
+                "data": {session_id: results[session_id] for session_id in session_ids},
+                "time": datetime.now(timezone.utc)
             }
-        )
\ No newline at end of file
+        )
+
+    except Exception as e:
+        return server_error_response("An error occurred while validating sessions", e)
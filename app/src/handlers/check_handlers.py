@@ -1,6 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from datetime import datetime, timezone
+from app.database import get_pool_stats
+from app.src.services.db_prober import db_prober
+from app.src.services.replica_monitor import replica_monitor
 
 async def test_db_connection(db: AsyncSession):
     try:
@@ -14,3 +19,35 @@ async def test_db_connection(db: AsyncSession):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
+
+
+async def pool_status():
+    # Statistik pool koneksi (checked out, overflow, jumlah request yang menunggu)
+    return {
+        "status": "success",
+        "pool": get_pool_stats(),
+        "replica": replica_monitor.state()
+    }
+
+
+# Liveness: proses hidup, tidak menyentuh database
+async def liveness():
+    return {
+        "status": "success",
+        "message": "API is alive",
+        "time": datetime.now(timezone.utc).isoformat()
+    }
+
+
+# Readiness: memakai hasil terakhir dari background prober
+async def readiness():
+    state = db_prober.state()
+    return JSONResponse(
+        status_code=200 if state["healthy"] else 503,
+        content={
+            "status": "success" if state["healthy"] else "error",
+            "message": "Database connection successful" if state["healthy"] else "Database is not ready",
+            "database": state,
+            "time": datetime.now(timezone.utc).isoformat()
+        }
+    )
@@ -0,0 +1,85 @@
+from fastapi.responses import Response
+from app.database import get_pool_stats, replica_health
+from app.src.services.metrics import registry
+from app.src.services.session_cache import session_cache
+from app.src.services.search_cache import search_cache
+from app.src.services.password_service import password_hasher
+from app.src.services.session_reaper import session_reaper
+from app.src.services.session_toucher import session_toucher
+from app.src.services.db_prober import db_prober
+from app.src.services.rate_limiter import login_rate_limiter
+from app.src.services.session_tokens import token_revocations
+from app.src.services.auth_event_log import auth_event_log
+from app.src.services.admission import admission_controller
+
+
+# Nilai yang sudah dicatat oleh service lain, dibaca saat scrape
+def collect_runtime_metrics():
+    pool = get_pool_stats()
+    cache = session_cache.stats()
+    search = search_cache.stats()
+    limiter = login_rate_limiter.stats()
+    revocations = token_revocations.stats()
+    auth_events = auth_event_log.stats()
+    admission = admission_controller.stats()
+    touches = session_toucher.stats()
+    return [
+        ("db_pool_size", "gauge", "Configured connection pool size", pool["pool_size"]),
+        ("db_pool_checked_out", "gauge", "Connections currently checked out", pool["checked_out"]),
+        ("db_pool_overflow", "gauge", "Overflow connections currently open", pool["overflow"]),
+        ("db_pool_waiting", "gauge", "Requests currently waiting for a connection", pool["waiting"]),
+        ("db_pool_waits_total", "counter", "Connection checkouts that had to wait", pool["waits_total"]),
+        ("db_pool_wait_timeouts_total", "counter", "Connection checkouts that timed out", pool["wait_timeouts_total"]),
+        ("db_pool_wait_seconds_total", "counter", "Total time spent waiting for a connection", pool["wait_seconds_total"]),
+        ("db_probe_healthy", "gauge", "1 if the last background database probe succeeded", int(db_prober.healthy)),
+        ("db_probe_latency_ms", "gauge", "Latency of the last background database probe", db_prober.latency_ms or 0),
+        ("db_replica_available", "gauge", "1 if read-only queries are currently routed to the replica", int(replica_health["available"])),
+        ("db_replica_lag_seconds", "gauge", "Replication lag measured by the last replica check", replica_health["lag_seconds"] or 0),
+        ("db_replica_fallbacks_total", "counter", "Read sessions that fell back to the primary after a replica connection error", replica_health["fallbacks"]),
+        ("session_cache_size", "gauge", "Entries in the session cache", cache["size"]),
+        ("session_cache_hits_total", "counter", "Session cache hits", cache["hits"]),
+        ("session_cache_misses_total", "counter", "Session cache misses", cache["misses"]),
+        ("session_cache_evictions_total", "counter", "Session cache entries evicted by size", cache["evictions"]),
+        ("session_cache_expirations_total", "counter", "Session cache entries expired by TTL", cache["expirations"]),
+        ("session_cache_invalidations_total", "counter", "Session cache entries invalidated explicitly", cache["invalidations"]),
+        ("session_touch_pending", "gauge", "Sessions waiting for their sliding expiry extension to be written", touches["pending"]),
+        ("session_touch_extended_total", "counter", "Sessions whose expiry was extended by sliding expiry", touches["extended"]),
+        ("session_touch_dropped_total", "counter", "Session touches dropped because the pending set was full", touches["dropped"]),
+        ("session_touch_failed_total", "counter", "Session extensions lost because a batch update failed", touches["failed"]),
+        ("session_touch_flushes_total", "counter", "Batched sliding expiry flushes", touches["flushes"]),
+        ("users_search_cache_size", "gauge", "Entries in the username prefix search cache", search["size"]),
+        ("users_search_cache_hits_total", "counter", "Username prefix search cache hits", search["hits"]),
+        ("users_search_cache_misses_total", "counter", "Username prefix search cache misses", search["misses"]),
+        ("users_search_cache_evictions_total", "counter", "Username prefix search cache entries evicted by size", search["evictions"]),
+        ("password_hash_pending", "gauge", "Password hashing jobs running or queued", password_hasher.pending),
+        ("password_hash_rejected_total", "counter", "Password hashing jobs rejected because the queue was full", password_hasher.rejected),
+        ("login_rate_limit_allowed_total", "counter", "Login attempts allowed by the rate limiter", limiter["allowed"]),
+        ("login_rate_limit_rejected_ip_total", "counter", "Login attempts rejected by the per-IP limit", limiter["rejected_ip"]),
+        ("login_rate_limit_rejected_username_total", "counter", "Login attempts rejected by the per-username limit", limiter["rejected_username"]),
+        ("session_token_revocations", "gauge", "Revoked session tokens (token mode) or logged-out session ids (db mode) held in memory", revocations["revoked"]),
+        ("session_token_revocation_sync_failures_total", "counter", "Failed revocation list syncs", revocations["sync_failures"]),
+        ("auth_event_queue_depth", "gauge", "Auth events waiting to be written", auth_events["queue_depth"]),
+        ("auth_events_written_total", "counter", "Auth events written to the database", auth_events["written"]),
+        ("auth_events_dropped_total", "counter", "Auth events dropped because the queue was full", auth_events["dropped"]),
+        ("auth_events_failed_total", "counter", "Auth events lost because a batch insert failed", auth_events["failed"]),
+        ("admission_auth_active", "gauge", "Auth requests (login/register) currently admitted", admission["auth"]["active"]),
+        ("admission_auth_queued", "gauge", "Auth requests waiting for an admission slot", admission["auth"]["queued"]),
+        ("admission_auth_shed_queue_full_total", "counter", "Auth requests shed because the admission queue was full", admission["auth"]["shed_queue_full"]),
+        ("admission_auth_shed_timeout_total", "counter", "Auth requests shed after waiting past the queue deadline", admission["auth"]["shed_timeout"]),
+        ("admission_db_active", "gauge", "Database-backed requests currently admitted", admission["db"]["active"]),
+        ("admission_db_queued", "gauge", "Database-backed requests waiting for an admission slot", admission["db"]["queued"]),
+        ("admission_db_shed_queue_full_total", "counter", "Database-backed requests shed because the admission queue was full", admission["db"]["shed_queue_full"]),
+        ("admission_db_shed_timeout_total", "counter", "Database-backed requests shed after waiting past the queue deadline", admission["db"]["shed_timeout"]),
+        ("admission_pool_timeouts_total", "counter", "Requests answered 503 because a connection checkout timed out", admission["pool_timeouts"]),
+        ("session_reaper_deleted_total", "counter", "Expired sessions deleted by the reaper", session_reaper.total_deleted),
+    ]
+
+
+registry.add_collector(collect_runtime_metrics)
+
+
+async def metrics():
+    return Response(
+        content=registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
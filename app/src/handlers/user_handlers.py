@@ -1,83 +1,67 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import and_, text
 from datetime import datetime, timezone
-from app.src.models.model import User, Session
+from app.config import Config
+from app.database import open_read_session
+from app.src.models.model import User
+from app.src.services.search_cache import search_cache
+from app.src.schemas.schema import (
+    user_response_adapter, user_list_response_adapter, user_search_response_adapter, user_data_adapter
+)
+from app.src.schemas.responses import (
+    json_response, error_response, server_error_response,
+    make_etag, etag_matches, not_modified_response, conditional_headers
+)
 
 
 # Handler untuk mendapatkan user berdasarkan session_id
-async def get_user_by_session(session_id: str, db: AsyncSession):
-    try:
-        # Query session berdasarkan session_id
-        db_session = await db.execute(select(Session).filter(Session.session_id == session_id))
-        session = db_session.scalars().first()
-
-        # Jika session tidak ditemukan atau sudah kedaluwarsa
-        if not session:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": "error",
-                    "message": "Session not found or expired",
-                    "time": datetime.now(timezone.utc).isoformat()
-                }
-            )
-
-        # Query user berdasarkan user_id dari session
-        db_user = await db.execute(select(User).filter(User.id == session.user_id))
-        user = db_user.scalars().first()
-
-        if not user:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": "error",
-                    "message": "User not found",
-                    "time": datetime.now(timezone.utc).isoformat()
-                }
-            )
-
-        # Return data user
-        return JSONResponse(
-            status_code=200,
-            content={
-                "status": "success",
-                "data": {
-                    "id": user.id,
-                    "username": user.username,
-                    "email": user.email
-                },
-                "time": datetime.now(timezone.utc).isoformat()
-            }
-        )
+# (session sudah diresolusi oleh dependency get_current_user_read)
+async def get_user_by_session(current_user: dict | None, if_none_match: str | None = None):
+    # Jika session tidak ditemukan atau sudah kedaluwarsa
+    if current_user is None:
+        return error_response(404, "Session not found or expired")
 
-    except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "status": "error",
-                "message": f"An error occurred: {str(e)}",
-                "time": datetime.now(timezone.utc).isoformat()
-            }
-        )
+    # Data user tidak berubah -> 304 tanpa serialisasi body
+    etag = make_etag("user", current_user["id"], current_user["username"], current_user["email"])
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
 
+    # Return data user
+    return json_response(
+        user_response_adapter,
+        {
+            "status": "success",
+            "data": current_user,
+            "time": datetime.now(timezone.utc)
+        },
+        headers=conditional_headers(etag)
+    )
 
-# Handler untuk mendapatkan semua user
-async def get_all_users(db: AsyncSession):
+
+# Handler untuk mendapatkan semua user (keyset pagination berdasarkan User.id)
+async def get_all_users(db: AsyncSession, limit: int, after: int | None = None, if_none_match: str | None = None):
     try:
-        # Query semua user
-        db_users = await db.execute(select(User))
-        users = db_users.scalars().all()
-
-        if not users:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": "error",
-                    "message": "No users found",
-                    "time": datetime.now(timezone.utc).isoformat()
-                }
-            )
+        # Ambil limit + 1 baris untuk mengetahui apakah masih ada halaman berikutnya
+        query = select(User.id, User.username, User.email).order_by(User.id).limit(limit + 1)
+        if after is not None:
+            query = query.where(User.id > after)
+        db_users = await db.execute(query)
+        users = db_users.all()
+
+        if not users and after is None:
+            return error_response(404, "No users found")
+
+        # Versi halaman = baris halaman itu sendiri (range scan index primary key yang sama murahnya
+        # dengan max(id)). max(id) saja tidak cukup: urutan id tidak sama dengan urutan commit,
+        # jadi user dengan id lebih kecil bisa muncul setelah id yang lebih besar
+        etag = make_etag("users", limit, after, *(f"{user.id}/{user.username}/{user.email}" for user in users))
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(etag)
+
+        has_next = len(users) > limit
+        users = users[:limit]
 
         # return data user
         user_list = [
@@ -89,21 +73,123 @@ async def get_all_users(db: AsyncSession):
             for user in users
         ]
 
-        return JSONResponse(
-            status_code=200,
-            content={
+        return json_response(
+            user_list_response_adapter,
+            {
                 "status": "success",
                 "data": user_list,
-                "time": datetime.now(timezone.utc).isoformat()
-            }
+                "next_cursor": user_list[-1]["id"] if has_next else None,
+                "time": datetime.now(timezone.utc)
+            },
+            headers=conditional_headers(etag)
         )
 
     except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "status": "error",
-                "message": f"An error occurred: {str(e)}",
-                "time": datetime.now(timezone.utc).isoformat()
+        return server_error_response("An error occurred", e)
+
+
+def _username_prefix_condition(db: AsyncSession, prefix: str):
+    """
+    Kondisi range `prefix <= username < prefix berikutnya` (perbandingan per karakter).
+    Di PostgreSQL memakai operator text_pattern_ops agar index ix_users_username_pattern
+    tetap terpakai walau prefix dikirim sebagai parameter (termasuk plan generik).
+    """
+    following = ord(prefix[-1]) + 1
+    if 0xD800 <= following <= 0xDFFF:
+        # Surrogate tidak valid di UTF-8, lompat ke code point berikutnya
+        following = 0xE000
+    upper = prefix[:-1] + chr(following) if following <= 0x10FFFF else None
+
+    if db.get_bind().dialect.name == "postgresql":
+        lower_bound = User.username.op("~>=~")(prefix)
+        upper_bound = User.username.op("~<~")(upper) if upper else None
+    else:
+        lower_bound = User.username >= prefix
+        upper_bound = User.username < upper if upper else None
+    return lower_bound if upper_bound is None else and_(lower_bound, upper_bound)
+
+
+def _username_order(db: AsyncSession):
+    """
+    Urutan per karakter, sama dengan urutan index. Di PostgreSQL `ORDER BY username`
+    biasa memakai collation database yang tidak bisa dipenuhi index text_pattern_ops,
+    sehingga semua baris yang cocok harus di-sort dulu; `USING ~<~` membaca
+    ix_users_username_pattern berurutan dan berhenti di LIMIT.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return text("users.username USING ~<~")
+    return User.username
+
+
+# Handler pencarian user berdasarkan prefix username (case-sensitive)
+async def search_users(db: AsyncSession, prefix: str, limit: int):
+    try:
+        results = search_cache.get(prefix, limit)
+        if results is None:
+            rows = (await db.execute(
+                select(User.id, User.username)
+                .where(_username_prefix_condition(db, prefix))
+                .order_by(_username_order(db))
+                .limit(limit)
+            )).all()
+            results = [{"id": row.id, "username": row.username} for row in rows]
+            search_cache.set(prefix, limit, results)
+
+        return json_response(
+            user_search_response_adapter,
+            {
+                "status": "success",
+                "data": results,
+                "time": datetime.now(timezone.utc)
             }
         )
+
+    except Exception as e:
+        return server_error_response("An error occurred", e)
+
+
+# Generator untuk export semua user memakai server-side cursor (memori konstan)
+async def _stream_users(export_format: str, chunk_size: int):
+    # Sesi dibuka di dalam generator karena sesi dari dependency get_db
+    # sudah ditutup sebelum StreamingResponse mulai mengirim body
+    async with open_read_session() as db:
+        # Hanya kolom yang dibutuhkan, tanpa membangun objek ORM
+        users = await db.stream(
+            select(User.id, User.username, User.email)
+            .order_by(User.id)
+            .execution_options(yield_per=chunk_size)
+        )
+
+        if export_format == "json":
+            yield b'{"status":"success","data":['
+
+        first = True
+        buffer = []
+        async for user in users:
+            row = user_data_adapter.dump_json(
+                {"id": user.id, "username": user.username, "email": user.email}
+            ).decode()
+            if export_format == "json":
+                buffer.append(row if first else "," + row)
+            else:
+                buffer.append(row + "\n")
+            first = False
+
+            if len(buffer) >= chunk_size:
+                yield "".join(buffer).encode()
+                buffer.clear()
+
+        if buffer:
+            yield "".join(buffer).encode()
+
+        if export_format == "json":
+            yield f'],"time":"{datetime.now(timezone.utc).isoformat()}"}}'.encode()
+
+
+# Handler untuk export semua user secara streaming (NDJSON atau JSON)
+async def export_all_users(export_format: str):
+    media_type = "application/json" if export_format == "json" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_users(export_format, Config.USERS_EXPORT_CHUNK_SIZE),
+        media_type=media_type,
+    )
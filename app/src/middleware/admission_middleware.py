@@ -0,0 +1,52 @@
+from sqlalchemy import exc
+from app.database import checkout_timeout
+from app.src.services.admission import AdmissionController
+from app.src.schemas.responses import busy_response
+
+
+class AdmissionControlMiddleware:
+    """
+    Middleware ASGI untuk admission control: setiap request (kecuali route murah)
+    harus mendapat slot dari lane-nya sebelum masuk ke aplikasi. Jika tidak dapat
+    slot sebelum deadline, atau pool koneksi database habis (timeout checkout),
+    request langsung dijawab 503 dengan Retry-After alih-alih ikut menumpuk.
+    Request yang sudah diterima menunggu koneksi paling lama selama deadline lane-nya,
+    bukan DB_POOL_TIMEOUT penuh.
+    """
+
+    def __init__(self, app, controller: AdmissionController, enabled: bool = True):
+        self.app = app
+        self.controller = controller
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.controller.lane_for(scope["path"])
+        if lane is not None and not await lane.acquire():
+            await busy_response()(scope, receive, send)
+            return
+
+        timeout_token = checkout_timeout.set(lane.queue_timeout) if lane is not None else None
+        response_started = False
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, tracking_send)
+        except exc.TimeoutError:
+            # Timeout checkout pool koneksi yang tidak ditangani handler (mis. di dependency)
+            self.controller.pool_timeouts += 1
+            if response_started:
+                raise
+            await busy_response()(scope, receive, send)
+        finally:
+            if lane is not None:
+                checkout_timeout.reset(timeout_token)
+                lane.release()
@@ -0,0 +1,55 @@
+from app.src.schemas.responses import error_response
+
+
+class BodySizeLimitMiddleware:
+    """
+    Middleware ASGI yang menolak request body lebih besar dari `max_body_size`
+    dengan 413, baik dari header Content-Length maupun body chunked. Body dibaca
+    (paling banyak `max_body_size` byte) sebelum aplikasi dipanggil, sehingga
+    penolakan tidak pernah terjadi di tengah parsing body oleh FastAPI.
+    """
+
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_size:
+                    await self._reject(scope, receive, send)
+                    return
+                break
+
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Klien putus sebelum body selesai dikirim
+                return
+            body += message.get("body", b"")
+            if len(body) > self.max_body_size:
+                await self._reject(scope, receive, send)
+                return
+            if not message.get("more_body", False):
+                break
+
+        replayed = False
+
+        async def buffered_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": bytes(body), "more_body": False}
+            # Setelah body, teruskan ke server (mis. http.disconnect)
+            return await receive()
+
+        await self.app(scope, buffered_receive, send)
+
+    async def _reject(self, scope, receive, send):
+        response = error_response(413, f"Request body exceeds {self.max_body_size} bytes")
+        await response(scope, receive, send)
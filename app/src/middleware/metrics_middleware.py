@@ -0,0 +1,46 @@
+import time
+from app.database import request_db_stats
+from app.src.services.metrics import (
+    http_request_duration,
+    http_request_db_queries,
+    http_request_db_duration,
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI yang mencatat latency per route + status code,
+    serta jumlah dan durasi query database untuk setiap request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        db_stats = [0, 0.0]
+        token = request_db_stats.set(db_stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_db_stats.reset(token)
+
+            # Template path (mis. /users/{session_id}) agar jumlah label tetap kecil
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_duration.observe(elapsed, scope["method"], route_path, status_code)
+            http_request_db_queries.observe(db_stats[0], route_path)
+            http_request_db_duration.observe(db_stats[1], route_path)
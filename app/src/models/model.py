@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from app.database import Base
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
@@ -13,12 +13,36 @@ class User(Base):
     # Relasi ke tabel Session
     sessions = relationship("Session", back_populates="user", cascade="all, delete")
 
+    # Index text_pattern_ops untuk pencarian prefix username (GET /users/search)
+    __table_args__ = (
+        Index("ix_users_username_pattern", "username", postgresql_ops={"username": "text_pattern_ops"}),
+    )
+
 class Session(Base):
     __tablename__ = "sessions"
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String, unique=True, index=True, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    expires_at = Column(DateTime, nullable=False)  
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True, nullable=False)
+    expires_at = Column(DateTime, index=True, nullable=False)
 
     # Relasi ke model User
     user = relationship("User", back_populates="sessions")
+
+
+class RevokedToken(Base):
+    # Token session (SESSION_MODE=token) yang sudah di-logout, disinkronkan ke memori setiap worker
+    __tablename__ = "revoked_tokens"
+    id = Column(Integer, primary_key=True, index=True)
+    token_id = Column(String, unique=True, nullable=False)
+    expires_at = Column(DateTime, index=True, nullable=False)
+    revoked_at = Column(DateTime, index=True, nullable=False)
+
+
+class AuthEvent(Base):
+    # Riwayat register/login/logout untuk audit keamanan, ditulis per batch oleh AuthEventLog
+    __tablename__ = "auth_events"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, index=True, nullable=True)
+    event = Column(String, nullable=False)
+    ip = Column(String, nullable=True)
+    created_at = Column(DateTime, index=True, nullable=False)
@@ -0,0 +1,58 @@
+"""
+Jalur cepat (SQLAlchemy Core) untuk query auth yang paling sering dipanggil.
+
+Statement dibangun sekali saat import dengan bindparam, lalu dieksekusi langsung
+di AsyncConnection milik sesi (tanpa kompilasi ORM, identity map, maupun objek
+User/Session). SQL yang dihasilkan selalu sama, sehingga compiled cache SQLAlchemy
+dan cache prepared statement asyncpg (DB_PREPARED_STATEMENT_CACHE_SIZE) selalu hit.
+Hasilnya berupa Row (named tuple ringan) dengan kolom yang dibutuhkan saja.
+"""
+from datetime import datetime
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.src.models.model import User, Session
+
+users = User.__table__
+sessions = Session.__table__
+
+# Session aktif -> data user (satu JOIN)
+SELECT_SESSION_USER = (
+    select(users.c.id, users.c.username, users.c.email, sessions.c.expires_at)
+    .select_from(sessions.join(users, sessions.c.user_id == users.c.id))
+    .where(sessions.c.session_id == bindparam("session_id"), sessions.c.expires_at > bindparam("now"))
+)
+
+# Data yang dibutuhkan login: id, email (token mode) dan hash password
+SELECT_LOGIN_USER = (
+    select(users.c.id, users.c.email, users.c.password)
+    .where(users.c.username == bindparam("username"))
+)
+
+# Logout dalam satu round trip: hapus session aktif dan kembalikan pemiliknya
+DELETE_ACTIVE_SESSION = (
+    delete(sessions)
+    .where(sessions.c.session_id == bindparam("session_id"), sessions.c.expires_at > bindparam("now"))
+    .returning(sessions.c.user_id)
+)
+
+
+async def _first(db: AsyncSession, statement, params: dict) -> Row | None:
+    connection = await db.connection()
+    return (await connection.execute(statement, params)).first()
+
+
+async def fetch_session_user(db: AsyncSession, session_id: str, now: datetime) -> Row | None:
+    """Row (id, username, email, expires_at) untuk session yang belum kedaluwarsa, atau None."""
+    return await _first(db, SELECT_SESSION_USER, {"session_id": session_id, "now": now})
+
+
+async def fetch_login_user(db: AsyncSession, username: str) -> Row | None:
+    """Row (id, email, password) untuk username, atau None."""
+    return await _first(db, SELECT_LOGIN_USER, {"username": username})
+
+
+async def delete_active_session(db: AsyncSession, session_id: str, now: datetime) -> int | None:
+    """Menghapus session aktif dan mengembalikan user_id-nya, atau None jika tidak ada. Belum di-commit."""
+    row = await _first(db, DELETE_ACTIVE_SESSION, {"session_id": session_id, "now": now})
+    return row.user_id if row else None
@@ -1,33 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from app.src.handlers.auth_handlers import register_user, login_user, logout_user
+from app.src.handlers.auth_handlers import register_user, login_user, logout_user, validate_sessions
+from app.src.schemas.schema import RegisterRequest, LoginRequest, LogoutRequest, SessionBatchRequest
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.dependencies import get_client_ip
 router = APIRouter()
 
 # Route for user registration
 
 @router.post("/register")
-async def register(request: Request, db: AsyncSession = Depends(get_db)):
-    request_data = await request.json()
-    username = request_data['username']
-    email = request_data['email']
-    password = request_data['password']
-    return await register_user(username, email, password, db)
+async def register(
+    body: RegisterRequest,
+    client_ip: str | None = Depends(get_client_ip),
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+):
+    return await register_user(body.username, body.email, body.password, db, read_db, client_ip)
 
 
 # Route for user login
 @router.post("/login")
-async def login(request: Request, db: AsyncSession = Depends(get_db)):
-    request_data = await request.json()
-    username = request_data['username']
-    password = request_data['password']
-    return await login_user(username, password, db)
+async def login(
+    body: LoginRequest,
+    client_ip: str | None = Depends(get_client_ip),
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+):
+    return await login_user(body.username, body.password, db, client_ip, read_db)
 
 
 # Route for user logout
 @router.post("/logout")
-async def logout(request: Request, db: AsyncSession = Depends(get_db)):
-    request_data = await request.json()
-    session_id = request_data['session-id']
-    return await logout_user(session_id,db)
+async def logout(
+    body: LogoutRequest,
+    client_ip: str | None = Depends(get_client_ip),
+    db: AsyncSession = Depends(get_db),
+):
+    return await logout_user(body.session_id, db, client_ip)
+
+
+# Route validasi banyak session sekaligus (read-only)
+@router.post("/sessions/validate")
+async def validate(
+    body: SessionBatchRequest,
+    read_db: AsyncSession = Depends(get_read_db),
+    db: AsyncSession = Depends(get_db),
+):
+    return await validate_sessions(body.session_ids, read_db, db)
@@ -1,9 +1,25 @@
 from fastapi import APIRouter, Depends
-from app.src.handlers.check_handlers import test_db_connection
+from app.src.handlers.check_handlers import test_db_connection, pool_status, liveness, readiness
 from app.database import get_db
 from sqlalchemy.orm import Session
 router = APIRouter()
 
+# deep=true menjalankan query langsung ke database (perilaku lama);
+# tanpa deep, hasil cache dari background prober yang dipakai
 @router.get("/")
-async def healthcheck_route(db: Session = Depends(get_db)):
-    return await test_db_connection(db)
+async def healthcheck_route(deep: bool = False, db: Session = Depends(get_db)):
+    if deep:
+        return await test_db_connection(db)
+    return await readiness()
+
+@router.get("/live")
+async def liveness_route():
+    return await liveness()
+
+@router.get("/ready")
+async def readiness_route():
+    return await readiness()
+
+@router.get("/pool")
+async def pool_status_route():
+    return await pool_status()
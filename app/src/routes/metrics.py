@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from app.src.handlers.metrics_handlers import metrics
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def metrics_route():
+    return await metrics()
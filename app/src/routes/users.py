@@ -1,14 +1,38 @@
-from app.src.handlers.user_handlers import get_user_by_session, get_all_users
-from fastapi import APIRouter, Depends
-from app.database import get_db
+from app.src.handlers.user_handlers import get_user_by_session, get_all_users, export_all_users, search_users
+from fastapi import APIRouter, Depends, Header, Query
+from app.config import Config
+from app.database import get_read_db
+from app.dependencies import get_current_user_read
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
+# Didaftarkan sebelum "/{session_id}" agar "/export" dan "/search" tidak dianggap session_id
+@router.get("/export")
+async def export_users(format: str = Query("ndjson", pattern="^(ndjson|json)$")):
+    return await export_all_users(format)
+
+@router.get("/search")
+async def search(
+    prefix: str = Query(..., min_length=1, max_length=150),
+    limit: int = Query(Config.USERS_SEARCH_DEFAULT_LIMIT, ge=1, le=Config.USERS_SEARCH_MAX_LIMIT),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await search_users(db, prefix, limit)
+
 @router.get("/{session_id}")
-async def get_user(session_id: str, db: AsyncSession = Depends(get_db)):
-    return await get_user_by_session(session_id, db)
+async def get_user(
+    session_id: str,
+    current_user: dict | None = Depends(get_current_user_read),
+    if_none_match: str | None = Header(None),
+):
+    return await get_user_by_session(current_user, if_none_match)
 
 @router.get("/")
-async def get_users(db: AsyncSession = Depends(get_db)):
-    return await get_all_users(db)
\ No newline at end of file
+async def get_users(
+    limit: int = Query(Config.USERS_PAGE_DEFAULT_LIMIT, ge=1, le=Config.USERS_PAGE_MAX_LIMIT),
+    after: int | None = Query(None, description="Cursor: id user terakhir dari halaman sebelumnya"),
+    db: AsyncSession = Depends(get_read_db),
+    if_none_match: str | None = Header(None),
+):
+    return await get_all_users(db, limit, after, if_none_match)
\ No newline at end of file
@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime, timezone
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import exc
+from app.config import Config
+from app.src.services.admission import admission_controller
+from app.src.schemas.schema import error_response_adapter
+
+
+# Response JSON yang diserialisasi langsung ke bytes lewat TypeAdapter yang sudah di-cache
+def json_response(adapter: TypeAdapter, payload: dict, status_code: int = 200, headers: dict | None = None) -> Response:
+    return Response(
+        content=adapter.dump_json(payload),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def error_response(status_code: int, message: str, headers: dict | None = None) -> Response:
+    return json_response(
+        error_response_adapter,
+        {
+            "status": "error",
+            "message": message,
+            "time": datetime.now(timezone.utc)
+        },
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+# 503 cepat saat server sedang penuh (admission control / pool koneksi habis)
+def busy_response() -> Response:
+    return error_response(
+        503, "Server is busy, please try again later", headers={"Retry-After": str(Config.ADMISSION_RETRY_AFTER)}
+    )
+
+
+# Error tak terduga di handler; timeout checkout pool koneksi dijawab 503 alih-alih 500
+def server_error_response(message: str, error: Exception) -> Response:
+    if isinstance(error, exc.TimeoutError):
+        # Timeout checkout pool koneksi: dihitung sebagai shed, sama seperti di AdmissionControlMiddleware
+        admission_controller.pool_timeouts += 1
+        return busy_response()
+    return error_response(500, f"{message}: {str(error)}")
+
+
+# ---------------------------------------------------------------------------
+# Conditional GET (ETag / If-None-Match)
+# ---------------------------------------------------------------------------
+
+# Data user bersifat pribadi: boleh disimpan klien, tapi selalu divalidasi ulang dengan ETag
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """ETag lemah dari beberapa nilai kecil (bukan dari hash seluruh body)."""
+    digest = hashlib.blake2b(":".join(str(part) for part in parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Perbandingan lemah: prefix W/ diabaikan di kedua sisi
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL})
+
+
+def conditional_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
@@ -0,0 +1,112 @@
+from datetime import datetime
+from typing import Annotated, Literal
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing_extensions import TypedDict
+from app.config import Config
+
+
+# ---------------------------------------------------------------------------
+# Request body
+# ---------------------------------------------------------------------------
+
+class RegisterRequest(BaseModel):
+    username: str = Field(min_length=1, max_length=150)
+    email: str = Field(min_length=3, max_length=254)
+    password: str = Field(min_length=1, max_length=128)
+
+
+class LoginRequest(BaseModel):
+    username: str = Field(min_length=1, max_length=150)
+    password: str = Field(min_length=1, max_length=128)
+
+
+class LogoutRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    # Panjang maksimum mencakup token session pada SESSION_MODE=token
+    session_id: str = Field(alias="session-id", min_length=1, max_length=512)
+
+
+class SessionBatchRequest(BaseModel):
+    session_ids: list[Annotated[str, Field(min_length=1, max_length=512)]] = Field(
+        min_length=1, max_length=Config.SESSION_BATCH_MAX_SIZE
+    )
+
+
+# ---------------------------------------------------------------------------
+# Response payload
+# TypedDict + TypeAdapter yang di-cache: serializer pydantic-core dikompilasi
+# sekali dan langsung menulis bytes JSON tanpa validasi ulang.
+# ---------------------------------------------------------------------------
+
+class UserData(TypedDict):
+    id: int
+    username: str
+    email: str
+
+
+class UserSearchResult(TypedDict):
+    id: int
+    username: str
+
+
+class UserSearchResponse(TypedDict):
+    status: str
+    data: list[UserSearchResult]
+    time: datetime
+
+
+class UserResponse(TypedDict):
+    status: str
+    data: UserData
+    time: datetime
+
+
+class UserListResponse(TypedDict):
+    status: str
+    data: list[UserData]
+    next_cursor: int | None
+    time: datetime
+
+
+class SessionResponse(TypedDict):
+    status: str
+    message: str
+    session_id: str
+    expires_at: datetime
+
+
+class SessionValidation(TypedDict):
+    valid: bool
+    # None jika valid; "expired" atau "not_found" jika tidak
+    reason: Literal["expired", "not_found"] | None
+    user: UserData | None
+
+
+class SessionValidationResponse(TypedDict):
+    status: str
+    # Urutan key mengikuti urutan session_ids di request
+    data: dict[str, SessionValidation]
+    time: datetime
+
+
+class MessageResponse(TypedDict):
+    status: str
+    message: str
+    time: datetime
+
+
+class ErrorResponse(TypedDict):
+    status: str
+    message: str
+    time: datetime
+
+
+user_response_adapter = TypeAdapter(UserResponse)
+user_list_response_adapter = TypeAdapter(UserListResponse)
+user_search_response_adapter = TypeAdapter(UserSearchResponse)
+session_response_adapter = TypeAdapter(SessionResponse)
+message_response_adapter = TypeAdapter(MessageResponse)
+session_validation_response_adapter = TypeAdapter(SessionValidationResponse)
+error_response_adapter = TypeAdapter(ErrorResponse)
+user_data_adapter = TypeAdapter(UserData)
@@ -0,0 +1,126 @@
+import asyncio
+from collections import deque
+from app.config import Config
+
+
+class AdmissionLane:
+    """
+    Batas jumlah request bersamaan untuk satu kelompok route, dengan antrean
+    terbatas. Request yang antre lebih lama dari `queue_timeout` detik, atau
+    yang datang saat antrean penuh, langsung ditolak (load shedding).
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> bool:
+        """Mengambil slot; False jika request harus ditolak."""
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+
+        if len(self._waiters) >= self.queue_size:
+            self.shed_queue_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # release() menyerahkan slot di iterasi loop yang sama dengan deadline
+                # (Python 3.12+ tetap melempar TimeoutError): slot sudah milik request ini
+                self.admitted += 1
+                return True
+            self.shed_timeout += 1
+            return False
+        except BaseException:
+            # Request dibatalkan (mis. klien putus) setelah slot diserahkan: kembalikan slotnya
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        self.admitted += 1
+        return True
+
+    def release(self):
+        # Slot langsung diserahkan ke request terlama yang masih menunggu
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+
+class AdmissionController:
+    """Memilih lane berdasarkan path request: bypass (route murah), auth (bcrypt) atau db."""
+
+    def __init__(self, bypass_paths: list[str], auth_paths: list[str], auth: AdmissionLane, db: AdmissionLane):
+        self.bypass_paths = {path.strip() for path in bypass_paths if path.strip()}
+        self.auth_paths = {path.strip().rstrip("/") for path in auth_paths if path.strip()}
+        self.auth = auth
+        self.db = db
+        self.pool_timeouts = 0
+
+    def lane_for(self, path: str) -> AdmissionLane | None:
+        if path in self.bypass_paths:
+            return None
+        if path.rstrip("/") in self.auth_paths:
+            return self.auth
+        return self.db
+
+    def stats(self) -> dict:
+        return {
+            "auth": self.auth.stats(),
+            "db": self.db.stats(),
+            "pool_timeouts": self.pool_timeouts,
+        }
+
+
+admission_controller = AdmissionController(
+    bypass_paths=Config.ADMISSION_BYPASS_PATHS,
+    auth_paths=Config.ADMISSION_AUTH_PATHS,
+    auth=AdmissionLane(
+        "auth",
+        concurrency=Config.ADMISSION_AUTH_CONCURRENCY,
+        queue_size=Config.ADMISSION_AUTH_QUEUE_SIZE,
+        queue_timeout=Config.ADMISSION_AUTH_QUEUE_TIMEOUT,
+    ),
+    db=AdmissionLane(
+        "db",
+        concurrency=Config.ADMISSION_DB_CONCURRENCY,
+        queue_size=Config.ADMISSION_DB_QUEUE_SIZE,
+        queue_timeout=Config.ADMISSION_DB_QUEUE_TIMEOUT,
+    ),
+)
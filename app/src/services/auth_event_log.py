@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from sqlalchemy import insert
+from app.config import Config
+from app.database import get_engine
+from app.src.models.model import AuthEvent
+
+logger = logging.getLogger(__name__)
+
+
+class AuthEventLog:
+    """
+    Log event auth (register/login/logout) yang ditulis di luar jalur request.
+    Handler hanya memasukkan event ke queue asyncio yang dibatasi ukurannya;
+    background task menulisnya dengan INSERT multi-row setiap `batch_size`
+    event atau setiap `flush_interval` detik. Jika queue penuh, event dibuang
+    dan dihitung sebagai dropped.
+    """
+
+    def __init__(self, enabled: bool, max_queue: int, batch_size: int, flush_interval: float):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    def record(self, event: str, user_id: int | None, ip: str | None = None):
+        if not self.enabled:
+            return
+        try:
+            self._queue.put_nowait({
+                "user_id": user_id,
+                "event": event,
+                "ip": ip,
+                # created_at disimpan sebagai UTC naive, diambil saat event terjadi
+                "created_at": datetime.now(timezone.utc).replace(tzinfo=None),
+            })
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _collect_batch(self) -> list[dict]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopping:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                # Sinyal dari stop(): tulis yang sudah terkumpul tanpa menunggu interval
+                break
+            batch.append(item)
+        return batch
+
+    async def flush(self, batch: list[dict]):
+        if not batch:
+            return
+        try:
+            async with get_engine().begin() as conn:
+                await conn.execute(insert(AuthEvent), batch)
+            self.written += len(batch)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Failed to write %d auth events", len(batch))
+
+    async def _run(self):
+        while not (self._stopping and self._queue.empty()):
+            await self.flush(await self._collect_batch())
+
+    def start(self):
+        if self._task is None and self.enabled:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Menulis semua event yang masih di queue, lalu menghentikan writer."""
+        if self._task is not None:
+            self._stopping = True
+            try:
+                # Membangunkan writer yang sedang menunggu event; jika queue penuh, writer tidak sedang menunggu
+                self._queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+            await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+auth_event_log = AuthEventLog(
+    enabled=Config.AUTH_EVENT_LOG_ENABLED,
+    max_queue=Config.AUTH_EVENT_QUEUE_SIZE,
+    batch_size=Config.AUTH_EVENT_BATCH_SIZE,
+    flush_interval=Config.AUTH_EVENT_FLUSH_INTERVAL,
+)
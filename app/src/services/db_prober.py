@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from sqlalchemy import text
+from app.config import Config
+from app.database import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseProber:
+    """
+    Background task yang mengecek koneksi database secara berkala (dengan timeout)
+    dan menyimpan hasilnya, sehingga probe readiness tidak perlu menyentuh database.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.healthy = False
+        self.latency_ms: float | None = None
+        self.database_version: str | None = None
+        self.last_error: str | None = None
+        self.last_checked: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _query_version(self) -> str:
+        async with get_engine().connect() as conn:
+            result = await conn.execute(text("SELECT version()"))
+            return result.scalar()
+
+    async def probe(self):
+        started = time.perf_counter()
+        try:
+            self.database_version = await asyncio.wait_for(self._query_version(), self.timeout)
+            self.healthy = True
+            self.last_error = None
+        except asyncio.TimeoutError:
+            self.healthy = False
+            self.last_error = f"Database probe timed out after {self.timeout}s"
+        except Exception as e:
+            self.healthy = False
+            self.last_error = str(e)
+        finally:
+            self.latency_ms = round((time.perf_counter() - started) * 1000, 3)
+            self.last_checked = datetime.now(timezone.utc)
+
+        if self.last_error:
+            logger.warning("Database probe failed: %s", self.last_error)
+
+    async def _run(self):
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def state(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "latency_ms": self.latency_ms,
+            "database_version": self.database_version,
+            "last_error": self.last_error,
+            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+        }
+
+
+db_prober = DatabaseProber(
+    interval=Config.DB_PROBE_INTERVAL,
+    timeout=Config.DB_PROBE_TIMEOUT,
+)
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.context import CryptContext
+from app.config import Config
+from app.src.services.metrics import password_hash_duration
+
+# min/max sama dengan default, sehingga needs_update() menandai hash dengan cost lain
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=Config.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=Config.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=Config.PASSWORD_BCRYPT_ROUNDS,
+)
+
+
+# Fungsi sinkron yang dijalankan di worker pool (harus top-level agar bisa di-pickle oleh process pool)
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+# Hash bcrypt cost 4 (murah) hanya untuk memuat backend bcrypt di setiap worker
+_WARMUP_HASH = "$2b$04$.iZzjBEc0o5uPlxg7SPWEueGCDnoXwpDJCgOh75ahD/5d64tvn5Ge"
+
+
+def _warmup() -> bool:
+    return pwd_context.verify("warmup", _WARMUP_HASH)
+
+
+class PasswordHasherBusy(Exception):
+    """Dilempar ketika antrean hashing sudah penuh (backpressure)."""
+
+
+class PasswordHasher:
+    """
+    Menjalankan bcrypt di thread/process pool agar event loop tidak terblokir.
+    Jumlah job yang sedang berjalan + menunggu di executor dibatasi oleh `max_pending`;
+    job baru di atas batas itu langsung ditolak dengan PasswordHasherBusy.
+    """
+
+    def __init__(self, executor_kind: str, workers: int, max_pending: int):
+        self.executor_kind = executor_kind
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, operation: str, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        future = loop.run_in_executor(self._get_executor(), fn, *args)
+        self.pending += 1
+
+        # Slot dilepas saat job executor selesai, bukan saat request berhenti menunggu:
+        # request yang dibatalkan (klien putus/timeout) tetap dihitung selama job-nya berjalan
+        def finished(_):
+            self.pending -= 1
+            password_hash_duration.observe(time.perf_counter() - started, operation)
+
+        future.add_done_callback(finished)
+        return await asyncio.shield(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", _verify, plain_password, hashed_password)
+
+    async def warmup(self):
+        """Menyalakan semua worker dan memuat backend bcrypt sebelum request pertama."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warmup) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_kind=Config.PASSWORD_HASH_EXECUTOR,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_pending=Config.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,90 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from app.config import Config
+
+
+class RateLimiterBackend(ABC):
+    """
+    Interface backend token bucket. Implementasi lain (mis. Redis) cukup
+    mengimplementasikan `acquire` agar limit berlaku bersama di semua instance.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Ambil satu token. Mengembalikan 0 jika diizinkan, atau detik sampai token berikutnya."""
+
+
+class InMemoryRateLimiterBackend(RateLimiterBackend):
+    """Token bucket per key di memori proses, dibatasi jumlah key-nya (LRU)."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+        if tokens >= 1:
+            retry_after = 0.0
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class LoginRateLimiter:
+    """
+    Membatasi percobaan login per IP client dan per username, sebelum ada
+    query database atau verifikasi bcrypt.
+    """
+
+    def __init__(self, backend: RateLimiterBackend, ip_per_minute: int, username_per_minute: int):
+        self.backend = backend
+        self.ip_per_minute = ip_per_minute
+        self.username_per_minute = username_per_minute
+        self.allowed = 0
+        self.rejected_ip = 0
+        self.rejected_username = 0
+
+    async def check(self, client_ip: str | None, username: str) -> float:
+        """Mengembalikan 0 jika request boleh lanjut, atau nilai Retry-After (detik)."""
+        if client_ip and self.ip_per_minute > 0:
+            retry_after = await self.backend.acquire(
+                f"login:ip:{client_ip}", self.ip_per_minute, self.ip_per_minute / 60
+            )
+            if retry_after:
+                self.rejected_ip += 1
+                return retry_after
+
+        if self.username_per_minute > 0:
+            retry_after = await self.backend.acquire(
+                f"login:user:{username.lower()}", self.username_per_minute, self.username_per_minute / 60
+            )
+            if retry_after:
+                self.rejected_username += 1
+                return retry_after
+
+        self.allowed += 1
+        return 0.0
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "rejected_ip": self.rejected_ip,
+            "rejected_username": self.rejected_username,
+        }
+
+
+login_rate_limiter = LoginRateLimiter(
+    backend=InMemoryRateLimiterBackend(max_keys=Config.RATE_LIMIT_MAX_KEYS),
+    ip_per_minute=Config.LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+    username_per_minute=Config.LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE,
+)
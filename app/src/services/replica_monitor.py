@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import text
+from app.config import Config
+from app.database import get_replica_engine, replica_health
+
+logger = logging.getLogger(__name__)
+
+# Lag replikasi dalam detik; 0 jika replica sudah memutar ulang semua WAL yang diterima
+# (atau jika server ternyata bukan standby)
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaMonitor:
+    """
+    Background task yang mengecek koneksi dan lag read replica secara berkala.
+    Replica hanya dipakai untuk pembacaan jika cek terakhir berhasil dan
+    lag-nya tidak melebihi `max_lag` detik.
+    """
+
+    def __init__(self, interval: float, timeout: float, max_lag: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.max_lag = max_lag
+        self.last_checked: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _query_lag(self) -> float:
+        replica = get_replica_engine()
+        async with replica.connect() as conn:
+            if replica.dialect.name != "postgresql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            return float((await conn.execute(REPLICA_LAG_QUERY)).scalar())
+
+    async def check(self):
+        if get_replica_engine() is None:
+            return
+        try:
+            lag = await asyncio.wait_for(self._query_lag(), self.timeout)
+            replica_health["lag_seconds"] = lag
+            if lag > self.max_lag:
+                replica_health["available"] = False
+                replica_health["last_error"] = f"Replication lag {lag:.1f}s exceeds {self.max_lag}s"
+            else:
+                replica_health["available"] = True
+                replica_health["last_error"] = None
+        except asyncio.TimeoutError:
+            replica_health["available"] = False
+            replica_health["last_error"] = f"Replica check timed out after {self.timeout}s"
+        except Exception as e:
+            replica_health["available"] = False
+            replica_health["last_error"] = str(e)
+        finally:
+            self.last_checked = datetime.now(timezone.utc)
+
+        if replica_health["last_error"]:
+            logger.warning("Read replica not used: %s", replica_health["last_error"])
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None and get_replica_engine() is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def state(self) -> dict:
+        return {
+            "configured": get_replica_engine() is not None,
+            **replica_health,
+            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+        }
+
+
+replica_monitor = ReplicaMonitor(
+    interval=Config.DB_REPLICA_CHECK_INTERVAL,
+    timeout=Config.DB_PROBE_TIMEOUT,
+    max_lag=Config.DB_REPLICA_MAX_LAG,
+)
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from app.config import Config
+
+
+class SearchCache:
+    """
+    Cache in-memory (LRU + TTL) untuk hasil pencarian prefix username.
+    Hanya prefix yang paling sering/terakhir dicari yang bertahan; user baru
+    muncul di hasil pencarian paling lambat setelah `ttl` detik.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[str, int], tuple[float, list]] = OrderedDict()
+
+    def get(self, prefix: str, limit: int) -> list | None:
+        key = (prefix, limit)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, prefix: str, limit: int, results: list):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+
+        key = (prefix, limit)
+        self._entries[key] = (time.monotonic() + self.ttl, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+search_cache = SearchCache(
+    max_size=Config.USERS_SEARCH_CACHE_SIZE,
+    ttl=Config.USERS_SEARCH_CACHE_TTL,
+)
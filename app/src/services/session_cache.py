@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from app.config import Config
+
+
+class SessionCache:
+    """
+    Cache in-memory (LRU + TTL) untuk hasil resolusi session_id -> data user.
+    TTL setiap entry dipotong agar tidak pernah melewati `Session.expires_at`.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, tuple[float, dict, datetime]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, session_id: str) -> dict | None:
+        entry = self.get_entry(session_id)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, session_id: str) -> tuple[dict, datetime] | None:
+        """Data user beserta `expires_at` session yang tercatat, atau None."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        deadline, payload, expires_at = entry
+        if deadline <= time.monotonic():
+            del self._entries[session_id]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(session_id)
+        self.hits += 1
+        return payload, expires_at
+
+    def set(self, session_id: str, payload: dict, expires_at: datetime):
+        if not self.enabled:
+            return
+
+        # expires_at disimpan sebagai UTC naive di database
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        ttl = min(self.ttl, (expires_at - now).total_seconds())
+        if ttl <= 0:
+            return
+
+        self._entries[session_id] = (time.monotonic() + ttl, payload, expires_at)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def extend(self, session_id: str, expires_at: datetime):
+        # Dipanggil setelah sliding expiry menulis expires_at baru ke database
+        entry = self._entries.get(session_id)
+        if entry is not None and entry[2] < expires_at:
+            self._entries[session_id] = (entry[0], entry[1], expires_at)
+
+    def invalidate(self, session_id: str):
+        if self._entries.pop(session_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+session_cache = SessionCache(
+    max_size=Config.SESSION_CACHE_MAX_SIZE,
+    ttl=Config.SESSION_CACHE_TTL,
+)
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import delete, select
+from app.config import Config
+from app.database import get_engine
+from app.src.models.model import Session, RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class SessionReaper:
+    """
+    Background task yang menghapus session (dan token yang dicabut) kedaluwarsa secara berkala.
+    Penghapusan dilakukan per batch (masing-masing transaksi sendiri)
+    agar satu kali reap tidak mengunci tabel sessions terlalu lama.
+    """
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.last_deleted = 0
+        self.total_deleted = 0
+        self.last_run: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _delete_batch(self, model, now: datetime) -> int:
+        expired_ids = (
+            select(model.id)
+            .where(model.expires_at < now)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with get_engine().begin() as conn:
+            result = await conn.execute(delete(model).where(model.id.in_(expired_ids)))
+            return result.rowcount
+
+    async def reap(self) -> int:
+        # expires_at disimpan sebagai UTC naive
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        deleted = 0
+        for model in (Session, RevokedToken):
+            while True:
+                batch_deleted = await self._delete_batch(model, now)
+                deleted += batch_deleted
+                if batch_deleted < self.batch_size:
+                    break
+                # Beri kesempatan request lain di antara batch
+                await asyncio.sleep(0)
+
+        self.last_deleted = deleted
+        self.total_deleted += deleted
+        self.last_run = datetime.now(timezone.utc)
+        if deleted:
+            logger.info("Session reaper deleted %d expired sessions/revoked tokens", deleted)
+        return deleted
+
+    async def _run(self):
+        while True:
+            try:
+                await self.reap()
+            except Exception:
+                logger.exception("Session reaper failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "last_deleted": self.last_deleted,
+            "total_deleted": self.total_deleted,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+        }
+
+
+session_reaper = SessionReaper(
+    interval=Config.SESSION_REAPER_INTERVAL,
+    batch_size=Config.SESSION_REAPER_BATCH_SIZE,
+)
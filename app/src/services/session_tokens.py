@@ -0,0 +1,166 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import Config
+from app.database import dialect_insert, new_session
+from app.src.models.model import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SessionTokenSigner:
+    """
+    Token session stateless untuk SESSION_MODE=token: `<payload>.<signature>`,
+    payload berisi [user id, username, email, expiry (unix), token id] dan
+    ditandatangani HMAC-SHA256, sehingga validasinya tidak butuh database.
+    """
+
+    def __init__(self, secret: str | None):
+        self._key = (secret or "").encode()
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._key, payload.encode(), hashlib.sha256).digest())
+
+    def issue(self, user_id: int, username: str, email: str, expires_at: datetime) -> str:
+        # expires_at disimpan sebagai UTC naive
+        expiry = int(expires_at.replace(tzinfo=timezone.utc).timestamp())
+        claims = [user_id, username, email, expiry, secrets.token_urlsafe(9)]
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        return f"{payload}.{self._sign(payload)}"
+
+    def decode(self, token: str, check_expiry: bool = True) -> dict | None:
+        """Mengembalikan claims token, atau None jika tanda tangan tidak valid atau sudah kedaluwarsa."""
+        payload, _, signature = token.partition(".")
+        if not signature or not hmac.compare_digest(signature.encode(), self._sign(payload).encode()):
+            return None
+        try:
+            user_id, username, email, expiry, token_id = json.loads(_b64decode(payload))
+        except (ValueError, TypeError):
+            return None
+        if check_expiry and expiry <= time.time():
+            return None
+        return {"id": user_id, "username": username, "email": email, "exp": expiry, "jti": token_id}
+
+
+class TokenRevocationList:
+    """
+    Daftar token yang sudah di-logout, dicek di memori pada setiap request.
+    Logout ditulis ke tabel revoked_tokens dan disinkronkan berkala ke memori
+    semua worker; entry dibuang setelah token aslinya kedaluwarsa.
+
+    Pada mode db daftar yang sama memuat session_id yang di-logout, agar cache
+    session di worker/instance lain berhenti memakai session tersebut dalam satu
+    interval sinkronisasi (bukan setelah SESSION_CACHE_TTL).
+    """
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self.sync_failures = 0
+        self._revoked: dict[str, int] = {}
+        self._synced_until: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def is_revoked(self, token_id: str) -> bool:
+        return token_id in self._revoked
+
+    async def _record(self, db: AsyncSession, token_id: str, expires_at: datetime):
+        await db.execute(
+            dialect_insert(db, RevokedToken)
+            .values(
+                token_id=token_id,
+                expires_at=expires_at,
+                revoked_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
+            .on_conflict_do_nothing()
+        )
+        self._revoked[token_id] = int(expires_at.replace(tzinfo=timezone.utc).timestamp())
+
+    async def revoke(self, db: AsyncSession, claims: dict):
+        expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc).replace(tzinfo=None)
+        await self._record(db, claims["jti"], expires_at)
+        await db.commit()
+
+    async def revoke_session(self, db: AsyncSession, session_id: str):
+        """
+        Mencatat session_id (mode db) yang di-logout, dalam transaksi yang sama dengan
+        DELETE-nya (belum di-commit). Cukup disimpan selama entry cache session bisa
+        hidup: SESSION_CACHE_TTL, ditambah lag replica maksimum untuk cache yang diisi
+        dari replica yang belum menerima DELETE.
+        """
+        expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(
+            seconds=Config.SESSION_CACHE_TTL + Config.DB_REPLICA_MAX_LAG
+        )
+        await self._record(db, session_id, expires_at)
+
+    async def sync(self):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        query = select(RevokedToken.token_id, RevokedToken.expires_at).where(RevokedToken.expires_at > now)
+        if self._synced_until is not None:
+            # Overlap satu interval agar logout yang commit terlambat tidak terlewat
+            query = query.where(
+                RevokedToken.revoked_at > self._synced_until - timedelta(seconds=self.sync_interval)
+            )
+
+        async with new_session() as db:
+            rows = (await db.execute(query)).all()
+        for row in rows:
+            self._revoked[row.token_id] = int(row.expires_at.replace(tzinfo=timezone.utc).timestamp())
+        self._synced_until = now
+
+        # Token yang sudah kedaluwarsa tetap ditolak oleh signer, tidak perlu disimpan lagi
+        current = time.time()
+        for token_id in [token_id for token_id, expiry in self._revoked.items() if expiry <= current]:
+            del self._revoked[token_id]
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync()
+            except Exception:
+                self.sync_failures += 1
+                logger.exception("Token revocation sync failed")
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {"revoked": len(self._revoked), "sync_failures": self.sync_failures}
+
+
+session_tokens = SessionTokenSigner(Config.SESSION_TOKEN_SECRET)
+token_revocations = TokenRevocationList(sync_interval=Config.TOKEN_REVOCATION_SYNC_INTERVAL)
+
+
+def resolve_token(token: str) -> dict | None:
+    """Memvalidasi token di dalam proses dan mengembalikan data user, atau None."""
+    claims = session_tokens.decode(token)
+    if claims is None or token_revocations.is_revoked(claims["jti"]):
+        return None
+    return {"id": claims["id"], "username": claims["username"], "email": claims["email"]}
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import DateTime, String, bindparam, column, update, values
+from app.config import Config
+from app.database import get_engine
+from app.src.models.model import Session
+from app.src.services.session_cache import session_cache
+
+logger = logging.getLogger(__name__)
+
+sessions = Session.__table__
+
+# Fallback untuk database tanpa UPDATE ... FROM (VALUES ...) ber-alias kolom (SQLite lokal)
+UPDATE_SESSION_EXPIRY = (
+    update(sessions)
+    .where(
+        sessions.c.session_id == bindparam("touch_session_id"),
+        sessions.c.expires_at > bindparam("touch_now"),
+        sessions.c.expires_at < bindparam("touch_extend_before"),
+    )
+    .values(expires_at=bindparam("touch_expires_at"))
+)
+
+
+class SessionToucher:
+    """
+    Sliding expiry untuk session mode db tanpa menambah write di jalur request.
+    Setiap resolusi session hanya mencatat "terakhir terlihat" di memori; session
+    diperpanjang paling sering sekali per `touch_interval` detik. Batas itu dicek lagi
+    di UPDATE terhadap expires_at di database, sehingga touch ganda dari worker lain
+    (yang cache-nya masih memegang expires_at lama) tidak menulis apa pun. Background
+    task menulis semua perpanjangan setiap `flush_interval` detik dengan satu
+    `UPDATE sessions ... FROM (VALUES ...)` per `batch_size` session. Jumlah write per
+    flush dibatasi oleh `max_pending`, bukan oleh jumlah request.
+    """
+
+    def __init__(self, enabled: bool, ttl: float, touch_interval: float, flush_interval: float,
+                 batch_size: int, max_pending: int):
+        self.enabled = enabled
+        self.ttl = timedelta(seconds=ttl)
+        self.touch_interval = timedelta(seconds=touch_interval)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.extended = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self._pending: dict[str, datetime] = {}
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def touch(self, session_id: str, expires_at: datetime):
+        """Mencatat pemakaian session; `expires_at` adalah nilai yang sekarang tersimpan (UTC naive)."""
+        if not self.enabled:
+            return
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        new_expires_at = now + self.ttl
+        # Sudah diperpanjang dalam touch_interval terakhir, atau sudah menunggu flush berikutnya
+        if new_expires_at - expires_at < self.touch_interval or session_id in self._pending:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending[session_id] = new_expires_at
+
+    async def _update_batch(self, conn, batch: list[tuple[str, datetime]], now: datetime) -> int:
+        # Hanya ditulis jika expires_at di database belum diperpanjang dalam touch_interval terakhir
+        rows = [(session_id, expires_at, expires_at - self.touch_interval) for session_id, expires_at in batch]
+        if conn.dialect.name != "postgresql":
+            result = await conn.execute(UPDATE_SESSION_EXPIRY, [
+                {
+                    "touch_session_id": session_id,
+                    "touch_now": now,
+                    "touch_expires_at": expires_at,
+                    "touch_extend_before": extend_before,
+                }
+                for session_id, expires_at, extend_before in rows
+            ])
+            return result.rowcount
+
+        touches = values(
+            column("session_id", String),
+            column("expires_at", DateTime),
+            column("extend_before", DateTime),
+            name="touches",
+        ).data(rows)
+        # Hanya memperpanjang: session yang sudah kedaluwarsa/logout tidak dihidupkan lagi
+        result = await conn.execute(
+            update(sessions)
+            .where(
+                sessions.c.session_id == touches.c.session_id,
+                sessions.c.expires_at > now,
+                sessions.c.expires_at < touches.c.extend_before,
+            )
+            .values(expires_at=touches.c.expires_at)
+        )
+        return result.rowcount
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        items = list(pending.items())
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        extended = 0
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            try:
+                async with get_engine().begin() as conn:
+                    extended += await self._update_batch(conn, batch, now)
+            except Exception:
+                # Tidak diulang: session tetap valid sampai expires_at lama dan akan di-touch lagi
+                self.failed += len(batch)
+                logger.exception("Failed to extend %d sessions", len(batch))
+                continue
+            for session_id, expires_at in batch:
+                session_cache.extend(session_id, expires_at)
+
+        self.extended += extended
+        self.flushes += 1
+        return extended
+
+    async def _run(self):
+        # Tidak di-cancel saat stop agar flush yang sedang berjalan tidak terpotong
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self):
+        if self._task is None and self.enabled:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Menulis perpanjangan yang tersisa, lalu menghentikan background task."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "extended": self.extended,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
+
+
+session_toucher = SessionToucher(
+    enabled=Config.SESSION_SLIDING_EXPIRY and Config.SESSION_MODE == "db",
+    ttl=Config.SESSION_TTL,
+    touch_interval=Config.SESSION_TOUCH_INTERVAL,
+    flush_interval=Config.SESSION_TOUCH_FLUSH_INTERVAL,
+    batch_size=Config.SESSION_TOUCH_BATCH_SIZE,
+    max_pending=Config.SESSION_TOUCH_MAX_PENDING,
+)
@@ -0,0 +1,82 @@
+"""
+Utilitas bersama untuk script benchmark: memuat `main.app`, mengganti dependency
+`get_db` dengan database lokal, menghitung round trip database, dan persentil latency.
+"""
+import importlib
+import os
+import sys
+import tempfile
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app(app_path: str | None = None):
+    """
+    Import `main` dari checkout repo (default: repo ini). `app_path` bisa menunjuk
+    ke git worktree revisi lain untuk membandingkan sebelum/sesudah perubahan.
+    """
+    sys.path.insert(0, os.path.abspath(app_path or REPO_ROOT))
+    return importlib.import_module("main")
+
+
+def default_database_url() -> str:
+    path = os.path.join(tempfile.mkdtemp(prefix="culture-connect-bench-"), "bench.db")
+    return f"sqlite+aiosqlite:///{path}"
+
+
+async def setup_database(main_module, database_url: str):
+    """
+    Membuat engine ke `database_url` dan mengarahkan `get_db` ke engine tersebut.
+    Untuk SQLite skema dibuat otomatis; untuk PostgreSQL jalankan `alembic upgrade head` dulu.
+    """
+    from app import database
+    from app.database import Base, get_db
+    import app.src.models.model  # noqa: F401 (registrasi tabel ke metadata)
+
+    engine = create_async_engine(database_url)
+    if engine.dialect.name == "sqlite":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # Engine juga dipasang ke aplikasi, agar background task & streaming memakai database yang sama
+    # (revisi lama tanpa configure_engine tetap bisa diuji lewat --app-path)
+    if hasattr(database, "configure_engine"):
+        database.configure_engine(engine)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    main_module.app.dependency_overrides[get_db] = override_get_db
+    return engine, session_factory
+
+
+class RoundTripCounter:
+    """Menghitung statement, BEGIN, COMMIT dan ROLLBACK yang dikirim ke database."""
+
+    def __init__(self, engine):
+        self.count = 0
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._increment)
+        for name in ("begin", "commit", "rollback"):
+            event.listen(sync_engine, name, self._increment)
+
+    def _increment(self, *args, **kwargs):
+        self.count += 1
+
+    def reset(self) -> int:
+        count, self.count = self.count, 0
+        return count
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,162 @@
+"""
+Load test end-to-end offline untuk API.
+
+Menjalankan `main.app` in-process lewat `httpx.AsyncClient` (tanpa jaringan),
+dengan dependency `get_db` diarahkan ke database lokal (default: file SQLite
+sementara lewat aiosqlite; bisa juga Postgres lokal lewat --database-url).
+
+Setiap virtual user menjalankan skenario register -> get user -> list users
+-> login -> logout secara bersamaan, lalu throughput dan latency p50/p95/p99
+per endpoint dilaporkan dan disimpan sebagai JSON.
+
+    python benchmarks/load_test.py --users 50 --iterations 5
+    python benchmarks/load_test.py --output results/after.json --baseline results/before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+# Konfigurasi default untuk benchmark; bisa dioverride lewat env
+os.environ.setdefault("DB_PROFILE", "test")
+os.environ.setdefault("LOGIN_RATE_LIMIT_IP_PER_MINUTE", "0")
+os.environ.setdefault("LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE", "0")
+
+import httpx  # noqa: E402
+
+from common import REPO_ROOT, default_database_url, load_app, percentile, setup_database  # noqa: E402
+
+ENDPOINTS = ("register", "get_user", "list_users", "login", "logout")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {name: [] for name in ENDPOINTS}
+        self.errors: dict[str, int] = {name: 0 for name in ENDPOINTS}
+
+    async def call(self, endpoint: str, request, expected_status: int = 200) -> httpx.Response:
+        started = time.perf_counter()
+        response = await request
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        if response.status_code != expected_status:
+            self.errors[endpoint] += 1
+        return response
+
+
+async def virtual_user(client: httpx.AsyncClient, recorder: Recorder, iterations: int, reads: int):
+    for _ in range(iterations):
+        username = f"load-{uuid.uuid4().hex[:12]}"
+        password = "loadTestPassword123"
+
+        response = await recorder.call("register", client.post(
+            "/auth/register",
+            json={"username": username, "email": f"{username}@example.com", "password": password},
+        ))
+        if response.status_code != 200:
+            continue
+        session_id = response.json()["session_id"]
+
+        for _ in range(reads):
+            await recorder.call("get_user", client.get(f"/users/{session_id}"))
+        await recorder.call("list_users", client.get("/users/", params={"limit": 50}))
+
+        response = await recorder.call("login", client.post(
+            "/auth/login", json={"username": username, "password": password}
+        ))
+        if response.status_code == 200:
+            session_id = response.json()["session_id"]
+
+        await recorder.call("logout", client.post("/auth/logout", json={"session-id": session_id}))
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for name in ENDPOINTS:
+        samples = recorder.latencies[name]
+        endpoints[name] = {
+            "requests": len(samples),
+            "errors": recorder.errors[name],
+            "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0,
+            "p50_ms": round(percentile(samples, 50), 3),
+            "p95_ms": round(percentile(samples, 95), 3),
+            "p99_ms": round(percentile(samples, 99), 3),
+        }
+    total = sum(item["requests"] for item in endpoints.values())
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total_requests": total,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0,
+        "endpoints": endpoints,
+    }
+
+
+def compare(result: dict, baseline: dict):
+    print("\nChange vs baseline (negative latency / positive throughput is better):")
+    for name, current in result["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        deltas = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if previous[key]:
+                deltas.append(f"{key} {(current[key] - previous[key]) / previous[key] * 100:+.1f}%")
+        print(f"  {name:<11} " + "  ".join(deltas))
+
+
+async def main(args):
+    main_module = load_app(args.app_path)
+    engine, _ = await setup_database(main_module, args.database_url or default_database_url())
+
+    transport = httpx.ASGITransport(app=main_module.app)
+    recorder = Recorder()
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            virtual_user(client, recorder, args.iterations, args.reads) for _ in range(args.users)
+        ))
+        elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    result = summarize(recorder, elapsed)
+    result["config"] = {
+        "users": args.users,
+        "iterations": args.iterations,
+        "reads": args.reads,
+        "database": engine.dialect.name,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"load_test-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(result, handle, indent=2)
+
+    print(f"{'endpoint':<11} {'requests':>8} {'errors':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, item in result["endpoints"].items():
+        print(
+            f"{name:<11} {item['requests']:>8} {item['errors']:>6} {item['throughput_rps']:>9.1f} "
+            f"{item['p50_ms']:>9.2f} {item['p95_ms']:>9.2f} {item['p99_ms']:>9.2f}"
+        )
+    print(f"total: {result['total_requests']} requests in {result['elapsed_seconds']}s "
+          f"({result['throughput_rps']} req/s), saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            compare(result, json.load(handle))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Jumlah virtual user bersamaan")
+    parser.add_argument("--iterations", type=int, default=3, help="Skenario per virtual user")
+    parser.add_argument("--reads", type=int, default=5, help="GET /users/{session_id} per skenario")
+    parser.add_argument("--database-url", default=None, help="Default: file SQLite sementara")
+    parser.add_argument("--app-path", default=None, help="Checkout repo yang diuji (default: repo ini)")
+    parser.add_argument("--output", default=None, help="File JSON hasil (default: benchmarks/results/)")
+    parser.add_argument("--baseline", default=None, help="File JSON hasil sebelumnya untuk dibandingkan")
+    asyncio.run(main(parser.parse_args()))
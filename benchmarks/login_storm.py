@@ -0,0 +1,89 @@
+"""
+Benchmark: latency p99 `GET /users/{session_id}` selama terjadi "login storm".
+
+Jalankan API terlebih dahulu dengan rate limit login dimatikan (storm login berulang
+dengan satu username dari satu IP, sehingga dengan limit aktif yang terukur adalah 429,
+bukan beban bcrypt), lalu:
+
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE=0 LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE=0 uvicorn main:app --port 8080
+    python benchmarks/login_storm.py --base-url http://localhost:8080
+
+Bandingkan hasilnya dengan PASSWORD_HASH_WORKERS / PASSWORD_HASH_EXECUTOR yang
+berbeda, atau dengan versi sebelum bcrypt dipindahkan ke worker pool.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from common import percentile
+
+
+async def login_storm(client: httpx.AsyncClient, username: str, password: str, stop: asyncio.Event, stats: dict):
+    while not stop.is_set():
+        response = await client.post("/auth/login", json={"username": username, "password": password})
+        stats[response.status_code] = stats.get(response.status_code, 0) + 1
+
+
+async def probe_user(client: httpx.AsyncClient, session_id: str, stop: asyncio.Event, latencies: list[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(f"/users/{session_id}")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def main(base_url: str, duration: float, storm: int, probes: int):
+    username = f"bench-{uuid.uuid4().hex[:8]}"
+    password = "benchPassword123"
+
+    limits = httpx.Limits(max_connections=storm + probes + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        response = await client.post(
+            "/auth/register",
+            json={"username": username, "email": f"{username}@example.com", "password": password},
+        )
+        response.raise_for_status()
+        session_id = response.json()["session_id"]
+
+        # Baseline tanpa login storm
+        stop = asyncio.Event()
+        idle_latencies: list[float] = []
+        tasks = [asyncio.create_task(probe_user(client, session_id, stop, idle_latencies)) for _ in range(probes)]
+        await asyncio.sleep(duration / 2)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+        # Dengan login storm
+        stop = asyncio.Event()
+        storm_latencies: list[float] = []
+        login_stats: dict[int, int] = {}
+        tasks = [asyncio.create_task(login_storm(client, username, password, stop, login_stats)) for _ in range(storm)]
+        tasks += [asyncio.create_task(probe_user(client, session_id, stop, storm_latencies)) for _ in range(probes)]
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    for label, samples in (("idle", idle_latencies), ("login storm", storm_latencies)):
+        print(
+            f"GET /users/{{session_id}} [{label}] n={len(samples)} "
+            f"p50={percentile(samples, 50):.1f}ms p95={percentile(samples, 95):.1f}ms "
+            f"p99={percentile(samples, 99):.1f}ms"
+        )
+    print(f"POST /auth/login status counts: {dict(sorted(login_stats.items()))}")
+    if login_stats.get(429):
+        print(
+            "WARNING: logins were rate limited (429); restart the server with "
+            "LOGIN_RATE_LIMIT_IP_PER_MINUTE=0 LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE=0 to measure bcrypt load"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durasi login storm (detik)")
+    parser.add_argument("--storm", type=int, default=32, help="Jumlah klien login bersamaan")
+    parser.add_argument("--probes", type=int, default=4, help="Jumlah klien GET /users/{session_id}")
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.duration, args.storm, args.probes))
@@ -0,0 +1,62 @@
+"""
+Micro-benchmark: biaya serialisasi response `get_all_users` untuk 10k user,
+membandingkan JSONResponse dari dict (cara lama) dengan TypeAdapter yang di-cache.
+
+    python benchmarks/serialization.py --users 10000 --repeat 50
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+
+from common import REPO_ROOT
+
+sys.path.insert(0, REPO_ROOT)
+from app.src.schemas.responses import json_response  # noqa: E402
+from app.src.schemas.schema import user_list_response_adapter  # noqa: E402
+
+
+def legacy(rows):
+    user_list = [{"id": id, "username": username, "email": email} for id, username, email in rows]
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "success",
+            "data": user_list,
+            "time": datetime.now(timezone.utc).isoformat()
+        }
+    )
+
+
+def type_adapter(rows):
+    user_list = [{"id": id, "username": username, "email": email} for id, username, email in rows]
+    return json_response(
+        user_list_response_adapter,
+        {
+            "status": "success",
+            "data": user_list,
+            "next_cursor": None,
+            "time": datetime.now(timezone.utc)
+        }
+    )
+
+
+def measure(fn, rows, repeat: int) -> float:
+    fn(rows)  # warmup
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = [(i, f"user{i}", f"user{i}@example.com") for i in range(1, args.users + 1)]
+    for name, fn in (("JSONResponse (dict)", legacy), ("TypeAdapter.dump_json", type_adapter)):
+        print(f"{name:<24} {measure(fn, rows, args.repeat):8.3f} ms per response ({args.users} users)")
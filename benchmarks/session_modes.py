@@ -0,0 +1,107 @@
+"""
+Benchmark mode session: membandingkan SESSION_MODE=db (session_id di tabel
+sessions) dengan SESSION_MODE=token (token HMAC stateless) untuk
+GET /users/{session_id}: throughput, latency p50/p99 dan query database per request.
+
+    python benchmarks/session_modes.py --users 50 --requests 5000
+    python benchmarks/session_modes.py --cache    # dengan session cache aktif (mode db)
+
+Setiap mode dijalankan di proses Python baru (Config dibaca saat import) dengan
+file SQLite sementara masing-masing. Secara default session cache dimatikan agar
+terlihat biaya resolusi session ke database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import REPO_ROOT, RoundTripCounter, default_database_url, load_app, percentile, setup_database
+
+
+async def child(args):
+    import httpx
+
+    main_module = load_app()
+    engine, _ = await setup_database(main_module, default_database_url())
+    counter = RoundTripCounter(engine)
+
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://sessionmodes", timeout=60) as client:
+        session_ids = []
+        for index in range(args.users):
+            response = await client.post("/auth/register", json={
+                "username": f"mode-{index}", "email": f"mode-{index}@example.com", "password": "modePassword123",
+            })
+            response.raise_for_status()
+            session_ids.append(response.json()["session_id"])
+
+        latencies: list[float] = []
+        errors = 0
+        per_user = max(1, args.requests // len(session_ids))
+
+        async def reader(session_id: str):
+            nonlocal errors
+            for _ in range(per_user):
+                started = time.perf_counter()
+                response = await client.get(f"/users/{session_id}")
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        counter.reset()
+        started = time.perf_counter()
+        await asyncio.gather(*(reader(session_id) for session_id in session_ids))
+        elapsed = time.perf_counter() - started
+        queries = counter.reset()
+
+    await engine.dispose()
+    print(json.dumps({
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "queries_per_request": queries / len(latencies) if latencies else 0,
+    }))
+
+
+def run_mode(mode: str, args) -> dict:
+    env = {
+        **os.environ,
+        "SESSION_MODE": mode,
+        "SESSION_TOKEN_SECRET": os.environ.get("SESSION_TOKEN_SECRET", "benchmark-secret"),
+        "DB_PROFILE": os.environ.get("DB_PROFILE", "test"),
+        "SESSION_REAPER_INTERVAL": "0",
+        "PASSWORD_BCRYPT_ROUNDS": os.environ.get("PASSWORD_BCRYPT_ROUNDS", "4"),
+    }
+    if not args.cache:
+        env["SESSION_CACHE_TTL"] = "0"
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child",
+         "--users", str(args.users), "--requests", str(args.requests)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="Jumlah user/session yang dibaca bersamaan")
+    parser.add_argument("--requests", type=int, default=5000, help="Total GET /users/{session_id}")
+    parser.add_argument("--cache", action="store_true", help="Aktifkan session cache (default: nonaktif)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(child(args))
+    else:
+        print(f"{'mode':<6} {'requests':>8} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'queries/req':>11}")
+        for mode in ("db", "token"):
+            item = run_mode(mode, args)
+            print(
+                f"{mode:<6} {item['requests']:>8} {item['errors']:>6} {item['rps']:>9.1f} "
+                f"{item['p50_ms']:>8.2f} {item['p99_ms']:>8.2f} {item['queries_per_request']:>11.2f}"
+            )
@@ -1,6 +1,102 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
 from datetime import datetime
-app = FastAPI()
+from app.src.services.password_service import password_hasher
+from app.src.services.db_prober import db_prober
+from app.src.services.session_reaper import session_reaper
+from app.src.services.session_toucher import session_toucher
+from app.src.services.replica_monitor import replica_monitor
+from app.src.services.session_tokens import token_revocations
+from app.src.services.session_cache import session_cache
+from app.src.services.auth_event_log import auth_event_log
+from app.config import Config
+from app.database import init_engine, dispose_engine
+from app.src.services.metrics import registry
+from app.src.middleware.metrics_middleware import MetricsMiddleware
+from app.src.middleware.body_limit_middleware import BodySizeLimitMiddleware
+from app.src.middleware.admission_middleware import AdmissionControlMiddleware
+from app.src.services.admission import admission_controller
+from app.src.schemas.responses import error_response
+
+
+logger = logging.getLogger(__name__)
+
+# Durasi import modul & startup, dilaporkan lewat log dan /metrics untuk memantau cold start
+startup_stats = {"import_seconds": 0.0, "startup_seconds": 0.0}
+
+
+async def _timed(coroutine) -> float:
+    started = time.perf_counter()
+    await coroutine
+    return time.perf_counter() - started
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    # Engine + warmup pool koneksi dan warmup backend bcrypt berjalan bersamaan
+    engine_seconds, hasher_seconds = await asyncio.gather(
+        _timed(init_engine(Config.DB_POOL_WARMUP)),
+        _timed(password_hasher.warmup()),
+    )
+    db_prober.start()
+    replica_monitor.start()
+    session_reaper.start()
+    session_toucher.start()
+    auth_event_log.start()
+    # Mode token: daftar token yang di-logout. Mode db: session yang di-logout di worker
+    # lain, untuk membuang entry cache session yang sudah basi.
+    if Config.SESSION_MODE == "token" or session_cache.enabled:
+        token_revocations.start()
+    startup_stats["startup_seconds"] = time.perf_counter() - started
+    logger.info(
+        "Startup finished in %.1f ms (imports %.1f ms, engine/pool warmup %.1f ms, password hasher warmup %.1f ms)",
+        startup_stats["startup_seconds"] * 1000,
+        startup_stats["import_seconds"] * 1000,
+        engine_seconds * 1000,
+        hasher_seconds * 1000,
+    )
+
+    yield
+
+    await token_revocations.stop()
+    # Event auth yang masih di queue ditulis sebelum koneksi ditutup
+    await auth_event_log.stop()
+    # Perpanjangan session yang belum ditulis juga di-flush
+    await session_toucher.stop()
+    await session_reaper.stop()
+    await db_prober.stop()
+    await replica_monitor.stop()
+    # Hentikan worker pool hashing dan tutup semua koneksi saat aplikasi dimatikan
+    password_hasher.shutdown()
+    await dispose_engine()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=Config.GZIP_MINIMUM_SIZE, compresslevel=Config.GZIP_COMPRESS_LEVEL)
+app.add_middleware(BodySizeLimitMiddleware, max_body_size=Config.MAX_REQUEST_BODY_BYTES)
+app.add_middleware(AdmissionControlMiddleware, controller=admission_controller, enabled=Config.ADMISSION_CONTROL_ENABLED)
+app.add_middleware(MetricsMiddleware)
+
+
+# Body request yang tidak valid (field hilang, tipe salah) dikembalikan sebagai 422
+# dengan format error yang sama seperti handler lain
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    errors = "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'] if part != 'body')}: {error['msg']}"
+        for error in exc.errors()
+    )
+    return error_response(422, f"Invalid request: {errors}")
+
 
 @app.get("/")
 async def root():
@@ -25,5 +121,16 @@ app.include_router(
     prefix="/users", 
     tags=["Users"]
 )
+
+app.include_router(
+    __import__("app.src.routes.metrics", fromlist=["router"]).router, 
+    tags=["Metrics"]
+)
+startup_stats["import_seconds"] = time.perf_counter() - _import_started
+registry.add_collector(lambda: [
+    ("app_import_seconds", "gauge", "Time spent importing the application modules", startup_stats["import_seconds"]),
+    ("app_startup_seconds", "gauge", "Time spent in the lifespan startup (engine and hasher warmup)", startup_stats["startup_seconds"]),
+])
+
 # app.include_router(check_router, prefix="/check", tags=["Check"])
 # app.include_router(auth_router, prefix="/auth", tags=["Check"])
@@ -0,0 +1,59 @@
+"""
+Kalibrasi cost bcrypt untuk host saat ini.
+
+Mengukur waktu hash untuk beberapa nilai rounds dan merekomendasikan nilai
+tertinggi yang median waktunya masih di bawah target latency.
+
+    python -m scripts.calibrate_bcrypt --target-ms 250
+    python -m scripts.calibrate_bcrypt --target-ms 100 --min-rounds 10 --max-rounds 14 --samples 7
+
+Jalankan di instance dengan alokasi CPU yang sama seperti production
+(mis. container Cloud Run), lalu set hasilnya ke env PASSWORD_BCRYPT_ROUNDS.
+"""
+import argparse
+import statistics
+import time
+
+import bcrypt
+
+from app.config import Config
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Median waktu hash (ms) untuk rounds tertentu."""
+    salt = bcrypt.gensalt(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", salt)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(target_ms: float, min_rounds: int, max_rounds: int, samples: int):
+    print(f"Current PASSWORD_BCRYPT_ROUNDS={Config.PASSWORD_BCRYPT_ROUNDS}, target {target_ms:.0f} ms per hash")
+    recommended = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        median_ms = measure(rounds, samples)
+        within_budget = median_ms <= target_ms
+        print(f"  rounds={rounds:<3} median={median_ms:9.1f} ms {'ok' if within_budget else 'over budget'}")
+        if within_budget:
+            recommended = rounds
+        else:
+            # Setiap kenaikan rounds menggandakan waktu, rounds berikutnya pasti lebih lambat
+            break
+
+    if recommended is None:
+        print(f"No rounds value >= {min_rounds} fits in {target_ms:.0f} ms; consider a larger CPU allotment.")
+    else:
+        print(f"Recommended: PASSWORD_BCRYPT_ROUNDS={recommended}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Budget latency per hash (ms)")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+    main(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
@@ -0,0 +1,230 @@
+"""
+Bulk import user dari sistem lama (CSV atau NDJSON) langsung ke tabel `users`.
+
+    python -m scripts.import_users users.csv
+    python -m scripts.import_users users.ndjson --chunk-size 5000 --conflicts-file conflicts.ndjson
+    cat users.csv | python -m scripts.import_users - --format csv
+
+Setiap baris wajib punya `username`, `email` dan `password` (string); baris yang
+tidak valid (JSON rusak, bukan object, field kosong/bukan string) dilaporkan per
+baris lalu dilewati. Password plaintext
+di-hash dengan bcrypt memakai process pool (semua core); password yang sudah
+berupa hash bcrypt dipakai apa adanya.
+
+Setiap chunk dimuat dengan COPY (`copy_records_to_table`) ke tabel staging
+sementara, lalu dipindahkan ke `users` dengan `INSERT ... ON CONFLICT DO NOTHING`,
+sehingga username/email yang bentrok dilaporkan per baris tanpa membatalkan batch.
+Koneksi memakai database yang sama dengan aplikasi (DATABASE_URL, atau DB_*).
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import asyncpg
+
+from app.database import get_database_url
+from app.src.services.password_service import _hash
+
+BCRYPT_HASH = re.compile(r"^\$2[abxy]?\$\d{2}\$[./A-Za-z0-9]{53}$")
+
+REQUIRED_FIELDS = ("username", "email", "password")
+
+CREATE_STAGING_TABLE = """
+    CREATE TEMP TABLE users_import (
+        row_number integer NOT NULL,
+        username text,
+        email text,
+        password text
+    ) ON COMMIT DELETE ROWS
+"""
+
+# id user diambil dari sequence users lebih dulu, sehingga RETURNING id bisa dipetakan
+# tepat ke row_number asalnya (id dari baris yang bentrok hanya menjadi celah di sequence)
+MOVE_STAGING_ROWS = """
+    WITH numbered AS (
+        SELECT row_number, nextval(pg_get_serial_sequence('users', 'id')) AS user_id, username, email, password
+        FROM users_import
+    ), inserted AS (
+        INSERT INTO users (id, username, email, password)
+        SELECT user_id, username, email, password FROM numbered ORDER BY row_number
+        ON CONFLICT DO NOTHING
+        RETURNING id
+    )
+    SELECT numbered.row_number FROM numbered JOIN inserted ON inserted.id = numbered.user_id
+"""
+
+
+class MalformedRow:
+    """Baris NDJSON yang tidak bisa di-parse; dilaporkan sebagai invalid tanpa menghentikan import."""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+
+
+def read_rows(path: str, input_format: str) -> Iterator[dict | MalformedRow]:
+    handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        if input_format == "csv":
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as exc:
+                        yield MalformedRow(f"invalid JSON: {exc.msg}")
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def row_error(row) -> str | None:
+    """Alasan baris ditolak, atau None jika baris valid."""
+    if isinstance(row, MalformedRow):
+        return row.reason
+    if not isinstance(row, dict):
+        return "row is not an object"
+    missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+    if missing:
+        return f"missing field(s): {', '.join(missing)}"
+    not_text = [field for field in REQUIRED_FIELDS if not isinstance(row[field], str)]
+    if not_text:
+        return f"field(s) must be strings: {', '.join(not_text)}"
+    return None
+
+
+def chunked(rows: Iterator, size: int) -> Iterator[list[tuple[int, dict]]]:
+    chunk = []
+    for row_number, row in enumerate(rows, start=1):
+        chunk.append((row_number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ImportReport:
+    def __init__(self, conflicts_file: str | None):
+        self.total = 0
+        self.inserted = 0
+        self.conflicts = 0
+        self.invalid = 0
+        self._conflicts_handle = open(conflicts_file, "w", encoding="utf-8") if conflicts_file else sys.stderr
+
+    def reject(self, row_number: int, row, reason: str):
+        if not isinstance(row, dict):
+            row = {}
+        record = {"row": row_number, "username": row.get("username"), "email": row.get("email"), "reason": reason}
+        self._conflicts_handle.write(json.dumps(record) + "\n")
+
+    def close(self):
+        if self._conflicts_handle is not sys.stderr:
+            self._conflicts_handle.close()
+
+
+async def hash_chunk(pool: ProcessPoolExecutor, chunk: list[tuple[int, dict]], report: ImportReport) -> list[tuple]:
+    """Validasi baris dan hash password plaintext secara paralel di process pool."""
+    loop = asyncio.get_running_loop()
+    valid = []
+    for row_number, row in chunk:
+        report.total += 1
+        error = row_error(row)
+        if error:
+            report.invalid += 1
+            report.reject(row_number, row, error)
+            continue
+        valid.append((row_number, row))
+
+    async def hashed(password: str) -> str:
+        if BCRYPT_HASH.match(password):
+            return password
+        return await loop.run_in_executor(pool, _hash, password)
+
+    passwords = await asyncio.gather(*(hashed(row["password"]) for _, row in valid))
+    return [
+        (row_number, row["username"], row["email"], password)
+        for (row_number, row), password in zip(valid, passwords)
+    ]
+
+
+async def load_chunk(conn: asyncpg.Connection, records: list[tuple], report: ImportReport):
+    if not records:
+        return
+    async with conn.transaction():
+        await conn.copy_records_to_table(
+            "users_import",
+            records=records,
+            columns=["row_number", "username", "email", "password"],
+        )
+        inserted = {row["row_number"] for row in await conn.fetch(MOVE_STAGING_ROWS)}
+
+    # Baris dimasukkan sesuai urutan row_number, jadi untuk username/email yang sama
+    # di satu chunk kemunculan pertama yang menang (kecuali baris itu sendiri bentrok)
+    for row_number, username, email, _ in records:
+        if row_number in inserted:
+            report.inserted += 1
+        else:
+            report.conflicts += 1
+            report.reject(row_number, {"username": username, "email": email}, "username or email already exists")
+
+
+def asyncpg_dsn() -> str:
+    """URL database aplikasi dalam format DSN asyncpg (tanpa driver SQLAlchemy dan opsi engine)."""
+    url = get_database_url()
+    if url.get_backend_name() != "postgresql":
+        raise SystemExit(f"import_users requires PostgreSQL, got {url.get_backend_name()}")
+    url = url.set(drivername="postgresql").difference_update_query(["prepared_statement_cache_size"])
+    return url.render_as_string(hide_password=False)
+
+
+async def import_users(path: str, input_format: str, chunk_size: int, workers: int, conflicts_file: str | None):
+    report = ImportReport(conflicts_file)
+    conn = await asyncpg.connect(asyncpg_dsn())
+    started = time.perf_counter()
+    try:
+        await conn.execute(CREATE_STAGING_TABLE)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Hashing chunk berikutnya berjalan bersamaan dengan COPY chunk sebelumnya
+            pending: list[tuple] | None = None
+            for chunk in chunked(read_rows(path, input_format), chunk_size):
+                hashing = asyncio.create_task(hash_chunk(pool, chunk, report))
+                if pending is not None:
+                    await load_chunk(conn, pending, report)
+                pending = await hashing
+                print(f"processed {report.total} rows", file=sys.stderr)
+            if pending is not None:
+                await load_chunk(conn, pending, report)
+    finally:
+        await conn.close()
+        report.close()
+
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "total": report.total,
+        "inserted": report.inserted,
+        "conflicts": report.conflicts,
+        "invalid": report.invalid,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(report.total / elapsed, 1) if elapsed else None,
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="File CSV/NDJSON, atau '-' untuk stdin")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None, help="Default: dari ekstensi file")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Jumlah proses hashing")
+    parser.add_argument("--conflicts-file", default=None, help="Tulis laporan baris yang ditolak (NDJSON); default stderr")
+    args = parser.parse_args()
+
+    input_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    asyncio.run(import_users(args.path, input_format, args.chunk_size, args.workers, args.conflicts_file))
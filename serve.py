@@ -0,0 +1,80 @@
+"""
+Menjalankan API dengan beberapa proses worker uvicorn.
+
+    python serve.py                      # WEB_CONCURRENCY worker (default: jumlah CPU)
+    WEB_CONCURRENCY=4 DB_MAX_CONNECTIONS=80 python serve.py
+
+Setiap worker adalah proses baru yang membuat engine dan pool koneksinya sendiri
+di lifespan. Ukuran pool (pool + overflow) per worker dipotong agar total koneksi
+semua worker tidak melebihi DB_MAX_CONNECTIONS (default 80), begitu juga pool read
+replica terhadap DB_REPLICA_MAX_CONNECTIONS. Worker pool bcrypt per proses juga
+dibagi agar total thread/proses hashing sebanding jumlah CPU.
+"""
+import importlib.util
+import logging
+import os
+
+import uvicorn
+
+from app.config import Config
+
+logger = logging.getLogger("serve")
+
+
+def pool_budget(workers: int, max_connections: int, pool_size: int, max_overflow: int) -> tuple[int, int]:
+    """Ukuran pool dan overflow per worker agar total koneksi semua worker <= max_connections."""
+    per_worker = max_connections // workers
+    if per_worker < 1:
+        raise SystemExit(
+            f"Connection budget {max_connections} is too small for {workers} workers; "
+            "raise DB_MAX_CONNECTIONS/DB_REPLICA_MAX_CONNECTIONS or lower WEB_CONCURRENCY"
+        )
+    pool_size = max(1, min(pool_size, per_worker))
+    return pool_size, max(0, min(max_overflow, per_worker - pool_size))
+
+
+def resolve(option: str, module: str, fallback: str) -> str:
+    if option != "auto":
+        return option
+    return module if importlib.util.find_spec(module) else fallback
+
+
+def main():
+    workers = max(1, Config.WEB_CONCURRENCY)
+
+    # Env diwariskan ke proses worker, yang membaca ulang Config saat import
+    pool_size, max_overflow = pool_budget(
+        workers, Config.DB_MAX_CONNECTIONS, Config.DB_POOL_SIZE, Config.DB_MAX_OVERFLOW
+    )
+    overrides = {"DB_POOL_SIZE": str(pool_size), "DB_MAX_OVERFLOW": str(max_overflow)}
+    if Config.DATABASE_REPLICA_URL:
+        replica_pool_size, replica_max_overflow = pool_budget(
+            workers, Config.DB_REPLICA_MAX_CONNECTIONS, Config.DB_REPLICA_POOL_SIZE, Config.DB_REPLICA_MAX_OVERFLOW
+        )
+        overrides["DB_REPLICA_POOL_SIZE"] = str(replica_pool_size)
+        overrides["DB_REPLICA_MAX_OVERFLOW"] = str(replica_max_overflow)
+    if "PASSWORD_HASH_WORKERS" not in os.environ:
+        overrides["PASSWORD_HASH_WORKERS"] = str(max(1, (os.cpu_count() or 1) // workers))
+    os.environ.update(overrides)
+
+    loop = resolve(Config.SERVER_LOOP, "uvloop", "asyncio")
+    http = resolve(Config.SERVER_HTTP, "httptools", "h11")
+    logger.warning(
+        "Starting %d worker(s) on %s:%d (loop=%s, http=%s, pool_size=%d, max_overflow=%d, "
+        "max primary connections=%d)",
+        workers, Config.HOST, Config.PORT, loop, http,
+        pool_size, max_overflow, workers * (pool_size + max_overflow),
+    )
+
+    uvicorn.run(
+        "main:app",
+        host=Config.HOST,
+        port=Config.PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+    )
+
+
+if __name__ == "__main__":
+    main()
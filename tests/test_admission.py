@@ -0,0 +1,32 @@
+import asyncio
+from app.src.services.admission import AdmissionLane
+
+
+def test_slot_handed_over_at_deadline_is_not_lost():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        lane = AdmissionLane("test", concurrency=1, queue_size=1, queue_timeout=0.05)
+        assert await lane.acquire()
+
+        # Waktu loop dibekukan agar release() dan deadline antrean dijadwalkan pada waktu
+        # yang sama; release() dijadwalkan lebih dulu sehingga jalan di iterasi yang sama
+        now = loop.time()
+        loop.time = lambda: now
+        try:
+            loop.call_at(now + lane.queue_timeout, lane.release)
+            waiting = asyncio.create_task(lane.acquire())
+            await asyncio.sleep(0)
+        finally:
+            del loop.time
+
+        admitted = await waiting
+        return lane, admitted
+
+    lane, admitted = asyncio.run(scenario())
+
+    assert admitted is True
+    assert lane.active == 1
+    assert lane.shed_timeout == 0
+    lane.release()
+    assert lane.active == 0
+    assert lane.stats()["queued"] == 0